@@ -0,0 +1,35 @@
+"""Kernlogik der Begehungs-App (ohne Streamlit-Abhängigkeit).
+
+Names below are imported from their submodule on first access, so scripts and
+`python -m begehung` only load what they actually use.
+"""
+import importlib
+
+_EXPORTS = {
+    "COLUMNS": "schema", "conform": "schema", "empty_frame": "schema",
+    "InspectionStore": "store", "TemplateItemDictionary": "store",
+    "Backend": "backend", "SharedTemplates": "backend", "VersionConflict": "backend",
+    "ExportCache": "export", "fingerprint": "export", "to_csv_bytes": "export", "to_xlsx_bytes": "export",
+    "ImportResult": "ingest", "import_csv": "ingest",
+    "InspectionIndex": "query",
+    "Rollups": "rollups",
+    "PARSED_COLUMNS": "values", "canonical_unit": "values", "parse_values": "values",
+    "IdGenerator": "ids", "new_id": "ids", "new_ids": "ids",
+    "ChecklistItem": "templates", "CompiledChecklist": "templates", "TemplateCatalog": "templates",
+    "compile_checklist": "templates",
+    "build_batch": "records", "build_batches": "records",
+    "ReportCache": "reports", "build_blank_form_docx": "reports", "build_inspection_report_docx": "reports",
+    "write_reports_zip": "reports",
+    "PROFILER": "profiling", "Profiler": "profiling",
+    "DEFAULT_TEMPLATES": "defaults", "MUSTERKUNDE": "defaults", "default_data_dir": "defaults",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,191 @@
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .templates import TemplateCatalog
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    variant  TEXT PRIMARY KEY,
+    items    TEXT NOT NULL,
+    version  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    rows     INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind     TEXT NOT NULL,
+    ref      TEXT NOT NULL,
+    created  REAL NOT NULL DEFAULT (julianday('now'))
+);
+CREATE INDEX IF NOT EXISTS changes_kind ON changes(kind, seq);
+"""
+
+
+class VersionConflict(Exception):
+    """A template was changed by someone else since it was loaded."""
+
+
+@dataclass(frozen=True)
+class Change:
+    seq: int
+    kind: str
+    ref: str
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections (WAL mode, shared by all threads/sessions)."""
+
+    def __init__(self, path, size: int = 4, timeout: float = 30.0):
+        self.path = str(path)
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+        self.size = size
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._pool.get().close()
+
+
+class Backend:
+    """Shared state in an embedded SQLite database (`begehung.db` in the data directory).
+
+    Holds the checklist templates (with a version per variant for optimistic
+    locking), hands out Parquet segment numbers so several processes can write to
+    one InspectionStore, and keeps a change log that readers poll cheaply.
+    """
+
+    def __init__(self, path, pool_size: int = 4):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.pool = ConnectionPool(path, size=pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; BEGIN IMMEDIATE serialises writers across processes."""
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---- change log ----
+    def record_change(self, conn: sqlite3.Connection, kind: str, ref: str) -> int:
+        return conn.execute("INSERT INTO changes(kind, ref) VALUES (?, ?)", (kind, ref)).lastrowid
+
+    def last_change(self, kind: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+        sql, params = "SELECT MAX(seq) FROM changes", ()
+        if kind is not None:
+            sql, params = sql + " WHERE kind = ?", (kind,)
+        if conn is not None:
+            return conn.execute(sql, params).fetchone()[0] or 0
+        with self.pool.connection() as c:
+            return c.execute(sql, params).fetchone()[0] or 0
+
+    def changes_since(self, seq: int, kind: Optional[str] = None,
+                      conn: Optional[sqlite3.Connection] = None) -> List[Change]:
+        sql, params = "SELECT seq, kind, ref FROM changes WHERE seq > ?", [seq]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY seq"
+        if conn is not None:
+            return [Change(*r) for r in conn.execute(sql, params)]
+        with self.pool.connection() as c:
+            return [Change(*r) for r in c.execute(sql, params)]
+
+    # ---- segments ----
+    def allocate_segment(self, conn: sqlite3.Connection, rows: int, floor: int = 0) -> int:
+        """Next global segment number (never below `floor`, e.g. segments written before the backend existed)."""
+        current = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'segments'").fetchone()
+        if floor and (current is None or current[0] < floor):
+            conn.execute("INSERT INTO segments(seq, rows) VALUES (?, 0)", (floor,))
+        return conn.execute("INSERT INTO segments(rows) VALUES (?)", (rows,)).lastrowid
+
+    # ---- templates ----
+    def seed_templates(self, templates: Dict[str, List[dict]]):
+        """Store `templates` unless the database already has templates."""
+        with self.transaction() as conn:
+            if conn.execute("SELECT COUNT(*) FROM templates").fetchone()[0]:
+                return
+            for variant, items in templates.items():
+                conn.execute("INSERT INTO templates(variant, items, version) VALUES (?, ?, 1)",
+                             (variant, json.dumps(items, ensure_ascii=False)))
+            self.record_change(conn, "templates", "*")
+
+    def load_templates(self) -> Tuple[Dict[str, List[dict]], Dict[str, int]]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT variant, items, version FROM templates ORDER BY rowid").fetchall()
+        return ({v: json.loads(items) for v, items, _ in rows}, {v: version for v, _, version in rows})
+
+    def save_template(self, variant: str, items: List[dict], expected_version: int) -> int:
+        """Replace one variant's items if it is still at `expected_version`; returns the new version."""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT version FROM templates WHERE variant = ?", (variant,)).fetchone()
+            current = row[0] if row else 0
+            if current != expected_version:
+                raise VersionConflict(f"Vorlage '{variant}' wurde inzwischen geändert (Version {current}, erwartet {expected_version}).")
+            payload = json.dumps(items, ensure_ascii=False)
+            if row:
+                conn.execute("UPDATE templates SET items = ?, version = ? WHERE variant = ?",
+                             (payload, current + 1, variant))
+            else:
+                conn.execute("INSERT INTO templates(variant, items, version) VALUES (?, ?, ?)",
+                             (variant, payload, current + 1))
+            self.record_change(conn, "templates", variant)
+            return current + 1
+
+
+class SharedTemplates:
+    """Process-wide TemplateCatalog backed by the database.
+
+    `catalog()` only re-reads the templates when the change log shows a template
+    change, so calling it on every rerun costs one indexed SELECT.
+    """
+
+    def __init__(self, backend: Backend, defaults: Dict[str, List[dict]]):
+        self.backend = backend
+        backend.seed_templates(defaults)
+        self._lock = threading.Lock()
+        self._seen = -1
+        self._catalog: Optional[TemplateCatalog] = None
+        self.versions: Dict[str, int] = {}
+
+    def catalog(self) -> TemplateCatalog:
+        with self._lock:
+            last = self.backend.last_change("templates")
+            if self._catalog is None or last != self._seen:
+                templates, self.versions = self.backend.load_templates()
+                self._catalog = TemplateCatalog(templates)
+                self._seen = last
+            return self._catalog
+
+    def save(self, variant: str, records, expected_version: int) -> int:
+        # normalised the same way the catalog does, so the stored JSON is clean
+        items = TemplateCatalog({variant: list(records)}).items(variant)
+        version = self.backend.save_template(variant, items, expected_version)
+        self.catalog()
+        return version
@@ -0,0 +1,224 @@
+"""Kommandozeile: `python -m begehung <befehl>` – Import, Abfrage und Export ohne Streamlit."""
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from .defaults import DEFAULT_TEMPLATES, default_data_dir
+from .schema import COLUMNS, STATUS_OPTIONS
+from .store import InspectionStore
+from .templates import VARIANTS, TemplateCatalog
+
+
+def _data_dir(args) -> Path:
+    return Path(args.data_dir or default_data_dir())
+
+
+def _backend(args):
+    from .backend import Backend
+    return Backend(_data_dir(args) / "begehung.db", pool_size=1)
+
+
+def _open_store(args) -> InspectionStore:
+    # same database as the app, so imports from here show up there (and vice versa)
+    return InspectionStore(_data_dir(args) / "inspections", backend=_backend(args))
+
+
+def _catalog(args) -> TemplateCatalog:
+    if args.templates:
+        return TemplateCatalog(json.loads(Path(args.templates).read_text(encoding="utf-8")))
+    from .backend import SharedTemplates
+    return SharedTemplates(_backend(args), DEFAULT_TEMPLATES).catalog()
+
+
+def _select(args, store: InspectionStore):
+    from .query import InspectionIndex
+    return InspectionIndex(store).select(technician=args.technician, city=args.city,
+                                         status=args.status, variant=args.variant, unit=args.unit,
+                                         value_min=args.value_min, value_max=args.value_max)
+
+
+def _query(args, store: InspectionStore) -> pd.DataFrame:
+    return store.flat(_select(args, store))
+
+
+def _write_table(df: pd.DataFrame, out: str):
+    from .export import to_csv_bytes, to_xlsx_bytes
+    if out == "-":
+        sys.stdout.write(df.to_csv(index=False))
+    elif out.lower().endswith(".xlsx"):
+        Path(out).write_bytes(to_xlsx_bytes(df))
+    else:
+        Path(out).write_bytes(to_csv_bytes(df))
+
+
+def cmd_import(args) -> int:
+    from .ingest import import_csv
+    store = _open_store(args)
+    failed = 0
+    for path in args.files:
+        try:
+            result = import_csv(path, store, chunksize=args.chunksize)
+        except ValueError as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        print(f"{path}: {result.rows_read} gelesen, {result.rows_added} übernommen, "
+              f"{result.rows_duplicate} bereits vorhanden, {result.rows_rejected} abgelehnt")
+        if args.rejected and result.rows_rejected:
+            result.rejected_frame().to_csv(args.rejected, index=False,
+                                           mode="a", header=not Path(args.rejected).exists())
+    return 1 if failed else 0
+
+
+def cmd_query(args) -> int:
+    view = _query(args, _open_store(args))
+    print(f"{len(view)} Zeilen, {view['inspection_id'].nunique()} Begehungen")
+    if args.head:
+        print(view.head(args.head).to_string(index=False))
+    return 0
+
+
+def cmd_export(args) -> int:
+    store = _open_store(args)
+    positions = _select(args, store)
+    if args.out.lower().endswith(".xlsx"):
+        # streamed chunk by chunk, never holding the whole view or workbook in memory
+        from .export import iter_store_chunks, write_xlsx
+        sheets = write_xlsx(iter_store_chunks(store, positions), args.out, split=args.split,
+                            columns=COLUMNS)
+        print(f"{len(positions)} Zeilen in {len(sheets)} Blättern → {args.out}")
+        return 0
+    _write_table(store.flat(positions), args.out)
+    if args.out != "-":
+        print(f"{len(positions)} Zeilen → {args.out}")
+    return 0
+
+
+def cmd_rollup(args) -> int:
+    from .rollups import CUBE_KEYS, VALUE_KEYS, Rollups
+    if args.by:
+        if args.backlog:
+            args.parser.error("--by ist mit --backlog nicht möglich")
+        allowed = VALUE_KEYS if args.values else [k for k in CUBE_KEYS if k != "status"]
+        wrong = [b for b in args.by if b not in allowed]
+        if wrong:
+            mode = "--values" if args.values else "Statuszahlen"
+            args.parser.error(f"--by {' '.join(wrong)} ist für {mode} nicht möglich (erlaubt: {', '.join(allowed)})")
+    rollups = Rollups(_open_store(args))
+    month = {"month": args.month} if args.month else {}
+    if args.backlog:
+        print(rollups.backlog().head(args.head or None).to_string(index=False))
+    elif args.values:
+        print(rollups.value_sums(args.by or "unit", **month).to_string())
+    else:
+        print(rollups.status_counts(args.by or "item_group", **month).to_string())
+    return 0
+
+
+def cmd_checklist(args) -> int:
+    checklist = _catalog(args).compile(args.variants)
+    _write_table(checklist.frame(), args.out)
+    return 0
+
+
+def cmd_blank_form(args) -> int:
+    from .reports import build_blank_form_docx
+    Path(args.out).write_bytes(build_blank_form_docx(_catalog(args).compile_all()))
+    print(f"Blanko-Formular → {args.out}")
+    return 0
+
+
+def cmd_reports(args) -> int:
+    from .reports import ReportCache, write_reports_zip
+    store = _open_store(args)
+    headers = store.headers()
+    mask = pd.Series(True, index=headers.index)
+    if args.date_from:
+        mask &= headers["date"] >= pd.Timestamp(args.date_from)
+    if args.date_to:
+        mask &= headers["date"] < pd.Timestamp(args.date_to) + pd.Timedelta(days=1)
+    ids = headers.loc[mask, "inspection_id"].dropna().tolist()
+    cache = ReportCache(_data_dir(args) / "reports")
+    count = write_reports_zip(store.select_inspections(ids), args.out, cache=cache, max_workers=args.workers)
+    print(f"{count} Berichte → {args.out}")
+    return 0
+
+
+def cmd_compact(args) -> int:
+    store = _open_store(args)
+    store.compact()
+    print(f"{len(store)} Zeilen in {len(store.inspection_ids())} Begehungen kompaktiert")
+    return 0
+
+
+def _add_filters(p: argparse.ArgumentParser):
+    p.add_argument("--technician", default="", help="Techniker*in enthält")
+    p.add_argument("--city", default="", help="Stadt enthält")
+    p.add_argument("--status", choices=STATUS_OPTIONS, default=None)
+    p.add_argument("--variant", default="", help="Varianten enthalten (z. B. Bronze+Gold)")
+    p.add_argument("--unit", default="", help="Einheit des Messwerts (kanonisch, z. B. kWp)")
+    p.add_argument("--min", dest="value_min", type=float, help="Messwert ab (in --unit)")
+    p.add_argument("--max", dest="value_max", type=float, help="Messwert bis (in --unit)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m begehung", description=__doc__)
+    parser.add_argument("--data-dir", help="Datenverzeichnis (Default: BEGEHUNG_DATA_DIR bzw. ./data)")
+    parser.add_argument("--templates", help="Checklisten-Vorlagen als JSON (Default: gemeinsame Vorlagen aus begehung.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="CSV-Bestand streamend einlesen und zusammenführen")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--chunksize", type=int, default=50_000)
+    p.add_argument("--rejected", help="abgelehnte Zeilen an diese CSV anhängen")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("query", help="Filter anwenden und Treffer zählen")
+    _add_filters(p)
+    p.add_argument("--head", type=int, default=0, help="die ersten N Zeilen ausgeben")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("export", help="gefilterte Zeilen als CSV/XLSX schreiben")
+    _add_filters(p)
+    p.add_argument("--out", required=True, help="Zieldatei (.csv/.xlsx) oder - für stdout")
+    p.add_argument("--split", choices=["month", "inspection"], default=None, help="XLSX: ein Blatt pro Monat/Begehung")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("rollup", help="Statuszahlen, Messwert-Summen oder offene Punkte je Liegenschaft")
+    p.add_argument("--by", nargs="+", choices=["item_group", "technician", "city", "variant_combo", "month", "unit"],
+                   help="Gruppierung (Default: item_group bzw. unit mit --values)")
+    p.add_argument("--month", help="nur diesen Monat (JJJJ-MM)")
+    p.add_argument("--values", action="store_true", help="Summen der numerischen Werte")
+    p.add_argument("--backlog", action="store_true", help="offene Punkte je Liegenschaftsnummer")
+    p.add_argument("--head", type=int, default=0)
+    p.set_defaults(func=cmd_rollup, parser=p)
+
+    p = sub.add_parser("checklist", help="aufgelöste Checkliste für Varianten ausgeben")
+    p.add_argument("--variants", nargs="+", default=VARIANTS, choices=VARIANTS)
+    p.add_argument("--out", default="-")
+    p.set_defaults(func=cmd_checklist)
+
+    p = sub.add_parser("blank-form", help="Blanko-Formular (DOCX) erzeugen")
+    p.add_argument("--out", default="Blanko_Formular_Begehung.docx")
+    p.set_defaults(func=cmd_blank_form)
+
+    p = sub.add_parser("reports", help="Begehungsberichte (DOCX) als ZIP erzeugen")
+    p.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    p.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--out", required=True)
+    p.set_defaults(func=cmd_reports)
+
+    p = sub.add_parser("compact", help="Parquet-Segmente zusammenfassen")
+    p.set_defaults(func=cmd_compact)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,105 @@
+import os
+from pathlib import Path
+
+# Checklist templates (wie V3)
+DEFAULT_TEMPLATES = {
+    "Bronze": [
+        {"item_group":"Allgemein","item_text":"Zugang Dachflächen / Sicherheit (Geländer, Anschlagpunkte)","unit":"","default":"offen"},
+        {"item_group":"PV/Elektrik","item_text":"Zählerschrank Zustand & Reserven","unit":"","default":"offen"},
+        {"item_group":"PV/Elektrik","item_text":"Netzverknüpfungspunkt (Hausanschluss, NH, SLS)","unit":"","default":"offen"},
+        {"item_group":"Gebäude","item_text":"Dachaufbau / Statik plausibel (Sichtprüfung)","unit":"","default":"offen"},
+        {"item_group":"Dokumente","item_text":"Fotos/Skizze Dach (Ausrichtung, Hindernisse)","unit":"","default":"offen"},
+        {"item_group":"Allgemein","item_text":"Begehungsanmeldung & Schlüsselkoordination (über kk&t)","unit":"","default":"offen"},
+        {"item_group":"Planung","item_text":"Größe/Leistung PV grob bestimmen (qm × 0,25 kWp/qm) – Schätzung","unit":"kWp","default":"offen"},
+        {"item_group":"Ertrag","item_text":"Dachausrichtung dokumentieren (keine Ertragsprognose)","unit":"","default":"offen"},
+        {"item_group":"Standorte","item_text":"Orte für Technik (Speicher, WR, Notstrom) – Vorschlag","unit":"","default":"offen"},
+        {"item_group":"Schaltschränke","item_text":"Elektrische Schaltschränke begutachten (Allgemeinzähler Keller)","unit":"","default":"offen"},
+        {"item_group":"Kommunikation","item_text":"Videocall-Nachbesprechung (Termin anbieten)","unit":"","default":"offen"},
+        {"item_group":"Finanzen","item_text":"Hinweis auf mögliche WEG-Finanzierung geben","unit":"","default":"offen"},
+        {"item_group":"Infrastruktur","item_text":"Stellplatzsituation/Wallbox/Lademanagement – Sichtprüfung","unit":"","default":"offen"},
+    ],
+    "Silber": [
+        {"item_group":"PV/Elektrik","item_text":"Einspeisepunkt / Messkonzept (Vorprüfung)","unit":"","default":"offen"},
+        {"item_group":"PV/Elektrik","item_text":"Leitungswege (Dach → Zählerschrank)","unit":"","default":"offen"},
+        {"item_group":"Gebäude","item_text":"Dachhaut / Abdichtung (Material, Alter, Zustand)","unit":"","default":"offen"},
+        {"item_group":"Gebäude","item_text":"Blitz-/Potenzialausgleich (Bestand)","unit":"","default":"offen"},
+        {"item_group":"Dokumente","item_text":"Planauszüge, Fotos, Maße (Beleg)","unit":"","default":"offen"},
+        {"item_group":"Allgemein","item_text":"Begehungsanmeldung & Schlüsselkoordination (über kk&t)","unit":"","default":"offen"},
+        {"item_group":"Planung","item_text":"Größe/Leistung PV: Objektfoto + tatsächliche Dachflächenberechnung","unit":"kWp","default":"offen"},
+        {"item_group":"Ertrag","item_text":"Ertragsprognose/Jahr (belegte Dachausrichtung)","unit":"kWh/a","default":"offen"},
+        {"item_group":"Regulatorik","item_text":"Netzverträglichkeitsprüfung/Anschlussbegehren – zubuchbares Paket 'Anmeldung/Anfrage Netzbetreiber'","unit":"","default":"offen"},
+        {"item_group":"Machbarkeit","item_text":"Technische Realisierbarkeit PV (Ausrichtung/Verschattung) – Bewertung","unit":"","default":"offen"},
+        {"item_group":"Netz","item_text":"Einholung Netzverträglichkeitsprüfung/Netzanschlussbegehren – optional (zubuchbar)","unit":"","default":"offen"},
+        {"item_group":"Statik","item_text":"Dachlasten prüfen & Dachzustand fotografisch festhalten (optional Drohne)","unit":"","default":"offen"},
+        {"item_group":"Elektrik","item_text":"Spätere Leitungsführung festlegen – Vorplanung (sofern möglich)","unit":"","default":"offen"},
+        {"item_group":"Brandschutz","item_text":"Brandabschottungen – Vorprüfung (sofern relevant)","unit":"","default":"offen"},
+        {"item_group":"Standorte","item_text":"Orte für Technik (Speicher, WR, Notstrom) – Konkretisierung","unit":"","default":"offen"},
+        {"item_group":"Schaltschränke","item_text":"Zählerschrank-Bewertung PLUS Kostenschätzung für Ertüchtigung","unit":"€","default":"offen"},
+        {"item_group":"Zähler/Mieterstrom","item_text":"Ausstattung Wohnungszähler bewerten (ohne Zählerplatzsichtung) + optional Werbebrief Mieterstrom (mit Zustimmung)","unit":"","default":"offen"},
+        {"item_group":"Verbräuche","item_text":"Bisherige Stromverbräuche erheben (nur Betriebsstrom)","unit":"kWh/a","default":"offen"},
+        {"item_group":"Kosten","item_text":"Vorschlag Verwendung Strom (WP, Betriebsstrom, Mieterstrom/GGV, Wallboxen) – grobe Vision","unit":"","default":"offen"},
+        {"item_group":"Wirtschaftlichkeit","item_text":"Amortisationsrechnung – grobe Systemschätzung","unit":"","default":"offen"},
+        {"item_group":"Kommunikation","item_text":"Videocall-Nachbesprechung durchführen","unit":"","default":"offen"},
+        {"item_group":"Finanzen","item_text":"Hinweis auf mögliche WEG-Finanzierung geben","unit":"","default":"offen"},
+        {"item_group":"Angebote","item_text":"Bewertung Drittangebote – NUR Texte/Ausschreibungsunterlagen sichten","unit":"","default":"offen"},
+        {"item_group":"Infrastruktur","item_text":"Stellplatzsituation/Wallbox/Lademanagement – Grobkonzept","unit":"","default":"offen"},
+        {"item_group":"Speicher","item_text":"Integration bestehender Speicher – Grobkonzept","unit":"","default":"offen"},
+    ],
+    "Gold": [
+        {"item_group":"PV/Elektrik","item_text":"String-Layout & Wechselrichter-Standort (Vorplanung)","unit":"","default":"offen"},
+        {"item_group":"PV/Elektrik","item_text":"Lastgänge / Verbrauchsstruktur (sofern vorhanden)","unit":"","default":"offen"},
+        {"item_group":"Systeme","item_text":"Speicher / Ladeinfrastruktur / WP: Machbarkeit & Schnittstellen","unit":"","default":"offen"},
+        {"item_group":"Regulatorik","item_text":"Messkonzept (GGV/Mieterstrom) – Detailaufnahme","unit":"","default":"offen"},
+        {"item_group":"Risiken","item_text":"Sonderpunkte: Statik-Red Flags, Brandschutz, Denkmalschutz","unit":"","default":"offen"},
+        {"item_group":"Allgemein","item_text":"Begehungsanmeldung & Schlüsselkoordination (über kk&t)","unit":"","default":"offen"},
+        {"item_group":"Planung","item_text":"Größe/Leistung PV: Drohnenaufnahmen + 3D-Aufnahme (inkl. Bronze+Silber)","unit":"kWp","default":"offen"},
+        {"item_group":"Ertrag","item_text":"Ertragsprognose/Jahr (szenariobasiert)","unit":"kWh/a","default":"offen"},
+        {"item_group":"Vertragsmodelle","item_text":"Dachpacht oder Contracting-Konzepte prüfen (Pflicht in Gold)","unit":"","default":"offen"},
+        {"item_group":"Machbarkeit","item_text":"Technische Realisierbarkeit PV (Ausrichtung/Verschattung) – Bewertung","unit":"","default":"offen"},
+        {"item_group":"Netz","item_text":"Einholung Netzverträglichkeitsprüfung & Netzanschlussbegehren – inkludiert","unit":"","default":"offen"},
+        {"item_group":"Statik","item_text":"Dachlasten prüfen & Dachzustand bebildert (inkl. Drohne möglich)","unit":"","default":"offen"},
+        {"item_group":"Elektrik","item_text":"Spätere Leitungsführung festlegen – Vorplanung verbindlich","unit":"","default":"offen"},
+        {"item_group":"Brandschutz","item_text":"Brandabschottungen – Prüfung/Erfordernis dokumentieren","unit":"","default":"offen"},
+        {"item_group":"Standorte","item_text":"Orte für Technik (Speicher, WR, Notstrom) – finale Vorschläge","unit":"","default":"offen"},
+        {"item_group":"Schaltschränke","item_text":"Zählerschrank – Fotos, Bewertung, Kostenschätzung + Video Keller/Heizung","unit":"","default":"offen"},
+        {"item_group":"Zähler/Mieterstrom","item_text":"Ausstattung Wohnungszähler bewerten + Mieterabfrage (vor Mieteranschreiben)","unit":"","default":"offen"},
+        {"item_group":"Verbräuche","item_text":"Bisherige Stromverbräuche erheben (Mieter/Nutzer + Betriebsstrom)","unit":"kWh/a","default":"offen"},
+        {"item_group":"Baustelle","item_text":"Kosten Gebäudeeinrüstung & Baustelleneinrichtung – Abschätzung","unit":"€","default":"offen"},
+        {"item_group":"WP","item_text":"Wärmepumpen-Machbarkeitsbetrachtung","unit":"","default":"offen"},
+        {"item_group":"Nutzung","item_text":"Vorschlag Verwendung Strom (WP, Betriebsstrom, Mieterstrom/GGV, Wallboxen) – Konzeptvorschlag","unit":"","default":"offen"},
+        {"item_group":"Wirtschaftlichkeit","item_text":"Amortisationsrechnung (mit/ohne Finanzierung, WEG-tauglich)","unit":"","default":"offen"},
+        {"item_group":"Kommunikation","item_text":"Nachbetrachtung in VC + ggf. lokale Medienarbeit initiieren","unit":"","default":"offen"},
+        {"item_group":"Kommunikation","item_text":"Videocall-Nachbesprechung durchführen","unit":"","default":"offen"},
+        {"item_group":"Finanzen","item_text":"Hinweis auf mögliche WEG-Finanzierung geben","unit":"","default":"offen"},
+        {"item_group":"Angebote","item_text":"Bewertung Drittangebote – inkl. Auswertung","unit":"","default":"offen"},
+        {"item_group":"Infrastruktur","item_text":"Stellplatz/Wallbox/Lademanagement – Konzeptvorschlag","unit":"","default":"offen"},
+        {"item_group":"Speicher","item_text":"Integration bestehender Speicher – Konzeptvorschlag","unit":"","default":"offen"},
+        {"item_group":"IT/Schnittstellen","item_text":"Technische Schnittstellen (Zähler, BMS, EVSE, SG-Ready, API) – Klärung","unit":"","default":"offen"},
+        {"item_group":"Schall","item_text":"Schallprüfung (WP/WR/Trafo) – Erfordernis & Maßnahmen","unit":"","default":"offen"},
+        {"item_group":"Genehmigungen","item_text":"Genehmigungsprüfung (Bau/Denkmalschutz/Sonderfälle)","unit":"","default":"offen"},
+    ]
+}
+
+# Musterkunde Default; `date` is set to date.today() where it is used
+MUSTERKUNDE = {
+    "customer_name": "WEG Beispielstraße 12",
+    "customer_email": "verwaltung@example.com",
+    "customer_phone": "0761-123456",
+    "address": "Beispielstraße 12",
+    "city": "Freiburg",
+    "plz": "79100",
+    "bundesland": "BW",
+    "liegenschaftsnummer": "LG-2025-001",
+    "technician": "Team Süd – Max & Lea",
+    "variants": ["Bronze","Silber"],
+    "prefill_values": {
+        ("Planung","Größe/Leistung PV grob bestimmen (qm × 0,25 kWp/qm) – Schätzung"): ("30", "kWp"),
+        ("Ertrag","Ertragsprognose/Jahr (belegte Dachausrichtung)"): ("28500", "kWh/a"),
+        ("Schaltschränke","Zählerschrank-Bewertung PLUS Kostenschätzung für Ertüchtigung"): ("2500", "€"),
+    }
+}
+
+
+def default_data_dir() -> Path:
+    """Data directory shared by app and CLI (`BEGEHUNG_DATA_DIR`, default: ./data next to app.py)."""
+    return Path(os.environ.get("BEGEHUNG_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
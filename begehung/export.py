@@ -0,0 +1,188 @@
+import hashlib
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXCEL_MAX_ROWS = 1_048_576
+CHUNK_ROWS = 10_000
+MAX_OPEN_SHEETS = 64  # every open write-only sheet holds a temp file (and a file descriptor)
+SPLIT_MODES = {None: "ein Blatt", "month": "pro Monat", "inspection": "pro Begehung"}
+_SHEET_NAME_BAD = re.compile(r"[\\/*?:\[\]]")
+
+
+def to_csv_bytes(df_export: pd.DataFrame) -> bytes:
+    return df_export.to_csv(index=False).encode("utf-8")
+
+
+def write_csv(chunks: Iterable[pd.DataFrame], out, columns: Optional[Sequence[str]] = None) -> int:
+    """Write row chunks as one CSV to the binary file-like `out`; returns the row count.
+
+    The header comes from the first chunk, or from `columns` if there are no chunks.
+    """
+    rows = 0
+    header = True
+    for chunk in chunks:
+        out.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+        rows += len(chunk)
+    if header and columns is not None:
+        out.write(pd.DataFrame(columns=list(columns)).to_csv(index=False).encode("utf-8"))
+    return rows
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterable[pd.DataFrame]:
+    if df.empty:
+        yield df
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_store_chunks(store, positions, chunk_rows: int = CHUNK_ROWS) -> Iterable[pd.DataFrame]:
+    """Materialise store rows at `positions` chunk by chunk (see InspectionStore.flat)."""
+    positions = np.asarray(positions)
+    for start in range(0, len(positions), chunk_rows):
+        yield store.flat(positions[start:start + chunk_rows])
+
+
+def _sheet_keys(chunk: pd.DataFrame, split: Optional[str]) -> pd.Series:
+    if split is None:
+        return pd.Series("Begehungen", index=chunk.index)
+    if split == "month":
+        return chunk["date"].dt.strftime("%Y-%m").fillna("ohne Datum")
+    if split == "inspection":
+        return chunk["inspection_id"].astype("string").fillna("ohne ID")
+    raise ValueError(f"Unbekannter Split-Modus: {split}")
+
+
+def write_xlsx(chunks: Iterable[pd.DataFrame], out, split: Optional[str] = None,
+               max_rows: int = EXCEL_MAX_ROWS, columns: Optional[Sequence[str]] = None,
+               max_open: int = MAX_OPEN_SHEETS) -> Dict[str, int]:
+    """Write row chunks to an XLSX file/file-like `out` with openpyxl's write-only mode.
+
+    Rows go straight to per-sheet temp files instead of a workbook object model, so
+    memory stays bounded by one chunk. With `split` ("month"/"inspection") each key
+    gets its own sheet; any sheet that reaches `max_rows` (Excel limit) continues on
+    "<name> (2)", "<name> (3)" … The header is `columns` (default: the first chunk's
+    columns), so an export without rows still gets one. Returns the number of data rows per sheet.
+
+    At most `max_open` sheets are kept open; the least recently written one is closed
+    beyond that. Rows sorted by the split key never reopen a sheet – otherwise a key
+    whose sheet was closed continues on its next "(n)" sheet.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    sheets = {}  # key -> [worksheet, rows incl. header, part, title]
+    open_keys: "OrderedDict[str, None]" = OrderedDict()  # keys with an open sheet, least recent first
+    written: Dict[str, int] = {}
+    columns = [str(c) for c in columns] if columns is not None else None
+
+    def open_sheet(key: str, part: int):
+        # Excel sheet names: max. 31 characters, no \ / * ? : [ ]
+        suffix = "" if part == 1 else f" ({part})"
+        title = (_SHEET_NAME_BAD.sub("_", key) or "Blatt")[:31 - len(suffix)] + suffix
+        ws = wb.create_sheet(title=title)  # openpyxl renames duplicates of truncated names
+        ws.append(columns)
+        old = sheets.get(key)
+        if old is not None and not old[0].closed:
+            old[0].close()
+        sheets[key] = [ws, 1, part, ws.title]
+        written[ws.title] = 0
+        open_keys.pop(key, None)
+        open_keys[key] = None
+        while len(open_keys) > max_open:
+            sheets[open_keys.popitem(last=False)[0]][0].close()
+
+    for chunk in chunks:
+        if columns is None:
+            columns = [str(c) for c in chunk.columns]
+        keys = _sheet_keys(chunk, split)
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for key, row in zip(keys, values.itertuples(index=False, name=None)):
+            entry = sheets.get(key)
+            if entry is None:
+                open_sheet(key, 1)
+                entry = sheets[key]
+            elif entry[1] >= max_rows or entry[0].closed:
+                open_sheet(key, entry[2] + 1)
+                entry = sheets[key]
+            else:
+                open_keys.move_to_end(key)
+            entry[0].append(row)
+            entry[1] += 1
+            written[entry[3]] += 1
+    if not sheets:
+        ws = wb.create_sheet(title="Begehungen")
+        if columns is not None:
+            ws.append(columns)
+        written[ws.title] = 0
+    wb.save(out)
+    return written
+
+
+def to_xlsx_bytes(df_export: pd.DataFrame, split: Optional[str] = None) -> bytes:
+    """XLSX payload for `df_export`, written in streaming mode and spooled to a temp file."""
+    with tempfile.TemporaryFile() as tmp:
+        write_xlsx(iter_chunks(df_export), tmp, split=split, columns=df_export.columns)
+        tmp.seek(0)
+        return tmp.read()
+
+
+def fingerprint(*parts) -> str:
+    """Stable key for a filter state (plus store version) – used as export cache key."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+class ExportCache:
+    """Bounded LRU for serialised export payloads.
+
+    Entries are evicted oldest-first once either `max_entries` or `max_bytes`
+    is exceeded; a single payload larger than `max_bytes` is returned but not kept.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        with self._lock:
+            payload = self._data.get(key)
+            if payload is not None:
+                self._data.move_to_end(key)
+            return payload
+
+    def put(self, key: Hashable, payload: bytes):
+        with self._lock:
+            if key in self._data:
+                self._size -= len(self._data.pop(key))
+            if len(payload) > self.max_bytes:
+                return
+            self._data[key] = payload
+            self._size += len(payload)
+            while len(self._data) > self.max_entries or self._size > self.max_bytes:
+                _, old = self._data.popitem(last=False)
+                self._size -= len(old)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        payload = self.get(key)
+        if payload is None:
+            payload = build()
+            self.put(key, payload)
+        return payload
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+from typing import List
+
+# Crockford base32, as used by ULID
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+def _encode(value: int) -> str:
+    chars = []
+    for _ in range(26):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class IdGenerator:
+    """ULID-style ID generator: 48 bit milliseconds + 80 bit random part.
+
+    IDs sort lexicographically by creation time. Within one millisecond the
+    random part is incremented, so IDs from one process are strictly monotonic;
+    separate processes/sessions draw independent random parts and do not collide.
+    """
+
+    def __init__(self):
+        self._reset()
+        # a forked child must not continue the parent's sequence
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._last_rand = 0
+
+    def _next(self, count: int) -> List[int]:
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._last_ms = ms
+                # leave headroom so increments within this millisecond cannot overflow
+                self._last_rand = int.from_bytes(os.urandom(10), "big") >> 1
+            values = []
+            for _ in range(count):
+                self._last_rand += 1
+                if self._last_rand > _RANDOM_MAX:
+                    self._last_ms += 1
+                    self._last_rand = int.from_bytes(os.urandom(10), "big") >> 1
+                values.append((self._last_ms << _RANDOM_BITS) | self._last_rand)
+            return values
+
+    def new_id(self, prefix: str = "INS") -> str:
+        return f"{prefix}-{_encode(self._next(1)[0])}"
+
+    def new_ids(self, count: int, prefix: str = "INS") -> List[str]:
+        """Mint `count` monotonically increasing IDs in one go (bulk imports)."""
+        return [f"{prefix}-{_encode(v)}" for v in self._next(count)]
+
+
+_default = IdGenerator()
+new_id = _default.new_id
+new_ids = _default.new_ids
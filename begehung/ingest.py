@@ -0,0 +1,121 @@
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+import pandas as pd
+
+from .schema import COLUMNS, STATUS_OPTIONS
+from .store import KEY_COLUMNS, InspectionStore
+
+# Columns an uploaded CSV must provide (contact fields are optional)
+REQUIRED_COLUMNS = [
+    "inspection_id","date","technician","customer_name","address","city","plz","bundesland",
+    "liegenschaftsnummer","variant_combo","item_id","item_group","item_text","status","value","unit","notes"
+]
+# Everything is read as text; `date` is parsed separately so bad values can be reported
+CSV_DTYPES = {c: "string" for c in COLUMNS}
+# only empty fields are missing – pandas' default NA strings would swallow the status "n/a"
+CSV_NA = {"keep_default_na": False, "na_values": [""]}
+DEFAULT_CHUNKSIZE = 50_000
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    rows_added: int = 0
+    rows_duplicate: int = 0
+    rejected: List[pd.DataFrame] = field(default_factory=list)
+
+    @property
+    def rows_rejected(self) -> int:
+        return sum(len(r) for r in self.rejected)
+
+    def rejected_frame(self) -> pd.DataFrame:
+        """Rejected rows with their CSV line number and a `reason` column."""
+        if not self.rejected:
+            return pd.DataFrame(columns=["line"] + COLUMNS + ["reason"])
+        return pd.concat(self.rejected, ignore_index=True)
+
+
+def missing_columns(columns) -> List[str]:
+    return [c for c in REQUIRED_COLUMNS if c not in set(columns)]
+
+
+def read_header(source) -> List[str]:
+    cols = list(pd.read_csv(source, nrows=0).columns)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return cols
+
+
+def iter_csv_chunks(source, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Yield the known columns of a CSV in chunks, all typed as string."""
+    with pd.read_csv(source, dtype=CSV_DTYPES, usecols=lambda c: c in CSV_DTYPES,
+                     chunksize=chunksize, **CSV_NA) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def split_valid(chunk: pd.DataFrame, first_line: int):
+    """Split a raw chunk into (valid rows with parsed date, rejected rows with reason)."""
+    chunk = chunk.copy()
+    chunk.insert(0, "line", range(first_line, first_line + len(chunk)))
+    reason = pd.Series("", index=chunk.index, dtype="object")
+
+    missing_key = chunk[KEY_COLUMNS].isna().any(axis=1)
+    for c in KEY_COLUMNS:
+        missing_key |= chunk[c].str.strip().eq("").fillna(False)
+    reason[missing_key] = "inspection_id/item_id fehlt"
+
+    bad_status = chunk["status"].notna() & ~chunk["status"].isin(STATUS_OPTIONS)
+    reason[bad_status & (reason == "")] = "Status ungültig"
+
+    parsed = pd.to_datetime(chunk["date"], errors="coerce", format="mixed")
+    bad_date = chunk["date"].notna() & parsed.isna()
+    reason[bad_date & (reason == "")] = "Datum ungültig"
+    chunk["date"] = parsed
+
+    bad = reason != ""
+    rejected = chunk.loc[bad].assign(reason=reason[bad])
+    valid = chunk.loc[~bad].drop(columns="line")
+    return valid, rejected
+
+
+def _source_size(source) -> Optional[int]:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    size = getattr(source, "size", None)
+    if size is None and hasattr(source, "getbuffer"):
+        size = source.getbuffer().nbytes
+    return size
+
+
+def import_csv(source, store: InspectionStore, chunksize: int = DEFAULT_CHUNKSIZE,
+               progress: Optional[Callable[[int, Optional[float]], None]] = None) -> ImportResult:
+    """Stream a Bestands-CSV into `store`.
+
+    The file is read chunk by chunk; each chunk is validated and merged against the
+    store's (inspection_id, item_id) index, so memory and merge cost scale with the
+    chunk, not with the inventory. `progress(rows_read, fraction)` is called after
+    every chunk; `fraction` is None when the source size is unknown.
+    """
+    missing = missing_columns(read_header(source))
+    if missing:
+        raise ValueError(f"Fehlende Spalten: {', '.join(missing)}")
+    size = _source_size(source)
+    result = ImportResult()
+    for chunk in iter_csv_chunks(source, chunksize=chunksize):
+        # line numbers as in the file (header = line 1)
+        valid, rejected = split_valid(chunk, first_line=result.rows_read + 2)
+        result.rows_read += len(chunk)
+        if not rejected.empty:
+            result.rejected.append(rejected)
+        added = store.merge(valid)
+        result.rows_added += len(added)
+        result.rows_duplicate += len(valid) - len(added)
+        if progress is not None:
+            fraction = None
+            if size and hasattr(source, "tell"):
+                fraction = min(source.tell() / size, 1.0)
+            progress(result.rows_read, fraction)
+    return result
@@ -0,0 +1,109 @@
+"""Rerun profiling: per-section timings of the Streamlit script, kept in memory and dumpable as JSON lines.
+
+Enable with BEGEHUNG_PROFILE=1 (or on the "Diagnose" page); with
+BEGEHUNG_PROFILE_FILE=<pfad> every finished rerun is also appended to that file.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+@dataclass
+class Run:
+    """Timings of one script run; sections may nest (form_build contains checklist_frame).
+
+    `outcome` tells how the run ended: "ok", "rerun" (st.rerun()), "stop" (st.stop()) or "error".
+    """
+    started: float = field(default_factory=time.perf_counter)
+    timestamp: float = field(default_factory=time.time)
+    page: str = ""
+    sections: Dict[str, float] = field(default_factory=dict)
+    total: Optional[float] = None
+    outcome: str = "ok"
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float):
+        self.sections[name] = self.sections.get(name, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        return {"timestamp": self.timestamp, "page": self.page, "total": self.total, "outcome": self.outcome,
+                "sections": dict(self.sections)}
+
+
+class Profiler:
+    """Process-wide collector for Runs (bounded ring buffer, thread-safe).
+
+    The first finished run of the process is kept separately as `startup` – it
+    includes the cold imports (pandas, python-docx …) and building the shared
+    store, index and rollups – whether or not profiling is enabled.
+    """
+
+    def __init__(self, max_runs: int = 1000, enabled: bool = False, path: Optional[str] = None):
+        self._runs: "deque[dict]" = deque(maxlen=max_runs)
+        self._lock = threading.Lock()
+        self.enabled = enabled or bool(path)
+        self.path = Path(path) if path else None
+        self.startup: Optional[dict] = None
+
+    def start_run(self, started: Optional[float] = None) -> Run:
+        return Run(started=started) if started is not None else Run()
+
+    def finish(self, run: Run):
+        run.total = time.perf_counter() - run.started
+        record = run.as_dict()
+        with self._lock:
+            if self.startup is None:
+                self.startup = record
+            if not self.enabled:
+                return
+            self._runs.append(record)
+            if self.path is not None:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def runs(self) -> List[dict]:
+        with self._lock:
+            return list(self._runs)
+
+    def reset(self):
+        with self._lock:
+            self._runs.clear()
+
+    def summary(self):
+        """Milliseconds per (page, section) over the recorded runs: count, mean, p50, p95, max."""
+        import pandas as pd
+        rows = [(r["page"], name, seconds * 1000)
+                for r in self.runs() for name, seconds in [("gesamt", r["total"]), *r["sections"].items()]]
+        frame = pd.DataFrame(rows, columns=["page", "section", "ms"])
+        grouped = frame.groupby(["page", "section"])["ms"]
+        table = grouped.agg(["count", "mean", "median", "max"])
+        table.insert(3, "p95", grouped.quantile(0.95))
+        return table.rename(columns={"median": "p50"}).sort_values("mean", ascending=False)
+
+    def to_jsonl(self) -> bytes:
+        lines = [json.dumps(r, ensure_ascii=False) for r in self.runs()]
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+    def dump(self, path) -> int:
+        """Write the recorded runs as JSON lines to `path`; returns the number of runs."""
+        payload = self.to_jsonl()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(payload)
+        return payload.count(b"\n")
+
+
+PROFILER = Profiler(enabled=bool(os.environ.get("BEGEHUNG_PROFILE")),
+                    path=os.environ.get("BEGEHUNG_PROFILE_FILE") or None)
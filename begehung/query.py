@@ -0,0 +1,193 @@
+import threading
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from .store import InspectionStore
+
+SORT_COLUMNS = ["date", "inspection_id", "item_id"]
+TEXT_FILTER_COLUMNS = ["technician", "city", "variant_combo"]
+CODE_COLUMNS = TEXT_FILTER_COLUMNS + ["status", "value_unit"]
+NGRAM = 3
+# NA sorts last, as with DataFrame.sort_values
+_NA_DATE = np.iinfo(np.int64).max
+_NA_TEXT = "\uffff"
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class ColumnDictionary:
+    """Categorical encoding of one text column.
+
+    Rows are stored as integer codes; distinct values are kept once, lowercased,
+    with a trigram index so substring filters only inspect candidate values.
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.lowered: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._chunks: List[np.ndarray] = []
+        self._codes: Optional[np.ndarray] = None
+
+    def add(self, col: pd.Series):
+        values = col.astype("string").fillna("").to_numpy(dtype=object)
+        uniques, inverse = np.unique(values, return_inverse=True)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, v in enumerate(uniques):
+            code = self._lookup.get(v)
+            if code is None:
+                code = len(self.values)
+                self._lookup[v] = code
+                self.values.append(v)
+                low = v.lower()
+                self.lowered.append(low)
+                for g in _grams(low):
+                    self._grams.setdefault(g, set()).add(code)
+            mapping[i] = code
+        self._chunks.append(mapping[inverse])
+        self._codes = None
+
+    @property
+    def codes(self) -> np.ndarray:
+        if self._codes is None:
+            self._codes = np.concatenate(self._chunks) if self._chunks else np.empty(0, dtype=np.int32)
+            self._chunks = [self._codes]
+        return self._codes
+
+    def code_of(self, value: str) -> int:
+        return self._lookup.get(value, -1)
+
+    def containing(self, needle: str) -> np.ndarray:
+        """Codes of all distinct values containing `needle` (case-insensitive)."""
+        needle = needle.lower()
+        grams = _grams(needle)
+        if grams:
+            candidates = set.intersection(*(self._grams.get(g, set()) for g in grams))
+        else:
+            candidates = range(len(self.values))
+        return np.fromiter((c for c in candidates if needle in self.lowered[c]), dtype=np.int32)
+
+
+class InspectionIndex:
+    """Filter/sort index over an InspectionStore, updated incrementally on every append.
+
+    Replaces the per-rerun `str.contains` scans and `sort_values` of the reporting
+    page: filters run on integer codes and results come back in presorted order.
+    """
+
+    def __init__(self, store: InspectionStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self.columns = {c: ColumnDictionary() for c in CODE_COLUMNS}
+        self._number_chunks: List[np.ndarray] = []
+        self._order_chunks: Optional[List[np.ndarray]] = []
+        self._last_key = None
+        self._rows = 0
+        with store._lock:
+            for batch, offset in store.iter_flat():
+                self._add(batch, offset)
+            store.subscribe(self._add)
+
+    @staticmethod
+    def _sorted_keys(batch: pd.DataFrame) -> pd.DataFrame:
+        dates = batch["date"].to_numpy(dtype="datetime64[ns]").view(np.int64).copy()
+        dates[dates == np.iinfo(np.int64).min] = _NA_DATE
+        keys = pd.DataFrame({
+            "date": dates,
+            "inspection_id": batch["inspection_id"].fillna(_NA_TEXT).to_numpy(dtype=object),
+            "item_id": batch["item_id"].fillna(_NA_TEXT).to_numpy(dtype=object),
+        })
+        return keys.sort_values(SORT_COLUMNS, kind="mergesort")
+
+    def _add(self, batch: pd.DataFrame, offset: int):
+        # called by the store under its lock
+        with self._lock:
+            for c, d in self.columns.items():
+                d.add(batch[c])
+            self._number_chunks.append(batch["value_num"].to_numpy(dtype=np.float64))
+            keys = self._sorted_keys(batch)
+            first = tuple(keys.iloc[0])
+            if self._order_chunks is not None and (self._last_key is None or first >= self._last_key):
+                # common case: new rows sort after everything stored – just extend the order
+                self._order_chunks.append(keys.index.to_numpy(dtype=np.int64) + offset)
+                self._last_key = tuple(keys.iloc[-1])
+            else:
+                self._order_chunks = None  # resorted lazily by order()
+            self._rows = offset + len(batch)
+
+    def order(self) -> np.ndarray:
+        """Item positions of the store sorted by date, inspection_id, item_id."""
+        while True:
+            with self._lock:
+                if self._order_chunks is not None:
+                    if len(self._order_chunks) != 1:
+                        merged = np.concatenate(self._order_chunks) if self._order_chunks else np.empty(0, dtype=np.int64)
+                        self._order_chunks = [merged]
+                    return self._order_chunks[0]
+                rows = self._rows
+            # full resort; the columns are fetched outside our lock (lock order: store → index)
+            frame = self.store.flat(np.arange(rows), columns=SORT_COLUMNS).reset_index(drop=True)
+            with self._lock:
+                if self._order_chunks is None and self._rows == rows:
+                    keys = self._sorted_keys(frame)
+                    self._order_chunks = [keys.index.to_numpy(dtype=np.int64)]
+                    self._last_key = tuple(keys.iloc[-1]) if rows else None
+
+    def _numbers(self) -> np.ndarray:
+        # caller holds self._lock
+        if len(self._number_chunks) != 1:
+            merged = np.concatenate(self._number_chunks) if self._number_chunks else np.empty(0)
+            self._number_chunks = [merged]
+        return self._number_chunks[0]
+
+    def numbers(self) -> np.ndarray:
+        """`value_num` of every stored row (canonical unit, NaN where not numeric)."""
+        with self._lock:
+            return self._numbers()
+
+    def units(self) -> List[str]:
+        """Canonical units that occur in the store."""
+        with self._lock:
+            return sorted(u for u in self.columns["value_unit"].values if u)
+
+    def select(self, technician: str = "", city: str = "", status: Optional[str] = None,
+               variant: str = "", unit: str = "", value_min: Optional[float] = None,
+               value_max: Optional[float] = None) -> np.ndarray:
+        """Sorted row positions matching all given filters (empty text/None = no filter).
+
+        `unit` matches the canonical unit exactly; `value_min`/`value_max` bound the
+        parsed numeric value (in that unit) and drop rows without a number.
+        """
+        order = self.order()
+        with self._lock:
+            mask = None
+            for col, needle in (("technician", technician), ("city", city), ("variant_combo", variant)):
+                if needle:
+                    d = self.columns[col]
+                    m = np.isin(d.codes, d.containing(needle))
+                    mask = m if mask is None else mask & m
+            for col, value in (("status", status), ("value_unit", unit or None)):
+                if value is not None:
+                    d = self.columns[col]
+                    m = d.codes == d.code_of(value)
+                    mask = m if mask is None else mask & m
+            # same lock as the code masks, so a concurrent append cannot change the row count in between
+            if value_min is not None or value_max is not None:
+                numbers = self._numbers()
+                with np.errstate(invalid="ignore"):
+                    m = ~np.isnan(numbers)
+                    if value_min is not None:
+                        m &= numbers >= value_min
+                    if value_max is not None:
+                        m &= numbers <= value_max
+                mask = m if mask is None else mask & m
+        return order if mask is None else order[mask[order]]
+
+    def query(self, **filters) -> pd.DataFrame:
+        """Filtered, sorted view in the flat layout (only matching rows are materialised)."""
+        return self.store.flat(self.select(**filters))
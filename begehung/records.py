@@ -0,0 +1,50 @@
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .ids import new_ids
+from .schema import COLUMNS, HEADER_FIELDS, ITEM_FIELDS, conform
+
+
+def variant_combo(variants: Iterable[str]) -> str:
+    variants = list(variants)
+    return "+".join(variants) if variants else "keine"
+
+
+def build_batches(inspections: Sequence[Tuple[dict, pd.DataFrame]]) -> pd.DataFrame:
+    """Flat rows for many Begehungen at once, built column-wise.
+
+    Each entry is (header, items): `header` holds the HEADER_FIELDS (a missing
+    inspection_id is minted), `items` the edited checklist with ITEM_FIELDS.
+    Header values are broadcast with np.repeat, item_ids are numbered per
+    inspection (ITM-001 …) and the result is typed (datetime date, categorical status).
+    """
+    if not inspections:
+        return conform(pd.DataFrame(columns=COLUMNS))
+    headers = [h for h, _ in inspections]
+    counts = np.array([len(items) for _, items in inspections], dtype=np.int64)
+    missing = [i for i, h in enumerate(headers) if not h.get("inspection_id")]
+    minted = iter(new_ids(len(missing)))
+    ids = [h.get("inspection_id") or next(minted) for h in headers]
+
+    items = pd.concat([items.reindex(columns=ITEM_FIELDS) for _, items in inspections], ignore_index=True)
+    cols = {}
+    for field in HEADER_FIELDS:
+        values = ids if field == "inspection_id" else [h.get(field) for h in headers]
+        cols[field] = np.repeat(np.array(values, dtype=object), counts)
+    cols["date"] = pd.to_datetime(cols["date"])
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    pos = pd.Series(np.arange(counts.sum()) - starts + 1)
+    cols["item_id"] = ("ITM-" + pos.astype(str).str.zfill(3)).to_numpy()
+    for field in ITEM_FIELDS:
+        cols[field] = items[field].to_numpy()
+    return conform(pd.DataFrame(cols))
+
+
+def build_batch(header: dict, items: pd.DataFrame, inspection_id: Optional[str] = None) -> pd.DataFrame:
+    """Flat rows for a single Begehung (see build_batches)."""
+    if inspection_id:
+        header = {**header, "inspection_id": inspection_id}
+    return build_batches([(header, items)])
+
@@ -0,0 +1,236 @@
+import hashlib
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .templates import CompiledChecklist
+
+# -------- Optional dependency: python-docx (for Blanko-Formular and Berichte) --------
+DOCX_OK = True
+DOCX_ERR = ""
+try:
+    from docx import Document
+    from docx.shared import Pt
+except Exception as e:
+    DOCX_OK = False
+    DOCX_ERR = str(e)
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# bump when the report layout changes, so cached reports are re-rendered
+REPORT_LAYOUT_VERSION = 1
+CUSTOMER_LABELS = [
+    ("Kunde / Ansprechpartner*in", "customer_name"), ("E-Mail", "customer_email"), ("Telefon", "customer_phone"),
+    ("Adresse", "address"), ("Stadt", "city"), ("PLZ", "plz"), ("Bundesland", "bundesland"),
+    ("Liegenschaftsnummer", "liegenschaftsnummer"), ("Techniker*in / Team", "technician"), ("Datum", "date"),
+]
+
+
+def _new_document():
+    if not DOCX_OK:
+        raise RuntimeError(f"'python-docx' fehlt: {DOCX_ERR}")
+    doc = Document()
+    style = doc.styles['Normal']
+    style.font.name = 'Arial'
+    style.font.size = Pt(10)
+    return doc
+
+
+def _add_checklist_tables(doc, groups: Iterable[Tuple[str, List[Tuple[str, str, str, str]]]], status_header: str):
+    # one table per item_group; rows are (Prüfpunkt, Status, Wert/Einheit, Notizen)
+    for g, rows in groups:
+        doc.add_heading(f"Gruppe: {g}", level=3)
+        table = doc.add_table(rows=len(rows)+1, cols=4)
+        hdr = table.rows[0].cells
+        hdr[0].text = "Prüfpunkt"
+        hdr[1].text = status_header
+        hdr[2].text = "Wert/Einheit"
+        hdr[3].text = "Notizen"
+        for i, cells in enumerate(rows, start=1):
+            for j, text in enumerate(cells):
+                table.rows[i].cells[j].text = text
+
+
+def _to_bytes(doc) -> bytes:
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def build_blank_form_docx(checklist: CompiledChecklist) -> bytes:
+    doc = _new_document()
+    doc.add_heading('Blanko-Formular – Begehung Kundenanlage', level=1)
+    doc.add_paragraph("Hinweis: Dieses Formular dient zur Erfassung vor Ort, ohne App.")
+
+    doc.add_heading('A. Kundendaten & Objekt', level=2)
+    for label, _ in CUSTOMER_LABELS:
+        doc.add_paragraph(f"{label}: _________________________________")
+
+    doc.add_heading('B. Varianten (bitte ankreuzen)', level=2)
+    doc.add_paragraph("[ ] Bronze     [ ] Silber     [ ] Gold")
+
+    doc.add_heading('C. Checkliste – Prüfpunkte', level=2)
+    _add_checklist_tables(doc, [(g, [(it.item_text, "____", "____", "") for it in items])
+                                for g, items in checklist.groups],
+                          status_header="Status (ok/offen/kritisch/n/a)")
+    return _to_bytes(doc)
+
+
+def _text(value) -> str:
+    if value is None or pd.isna(value):
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%d.%m.%Y")
+    return str(value)
+
+
+def build_inspection_report_docx(rows: pd.DataFrame) -> bytes:
+    """Filled Begehungsbericht for the flat rows of one inspection (same layout as the Blanko-Formular)."""
+    first = rows.iloc[0]
+    doc = _new_document()
+    doc.add_heading(f"Begehungsbericht – {_text(first['inspection_id'])}", level=1)
+
+    doc.add_heading('A. Kundendaten & Objekt', level=2)
+    for label, col in CUSTOMER_LABELS:
+        doc.add_paragraph(f"{label}: {_text(first[col])}")
+
+    doc.add_heading('B. Varianten', level=2)
+    doc.add_paragraph(_text(first["variant_combo"]))
+
+    counts = rows["status"].value_counts()
+    doc.add_paragraph("Status: " + ", ".join(f"{s}: {int(n)}" for s, n in counts.items()))
+
+    doc.add_heading('C. Checkliste – Prüfpunkte', level=2)
+    groups = {}
+    for r in rows.itertuples(index=False):
+        value = " ".join(v for v in (_text(r.value), _text(r.unit)) if v)
+        groups.setdefault(_text(r.item_group), []).append((_text(r.item_text), _text(r.status), value, _text(r.notes)))
+    _add_checklist_tables(doc, groups.items(), status_header="Status")
+    return _to_bytes(doc)
+
+
+def content_hash(rows: pd.DataFrame) -> str:
+    """Hash of an inspection's rows (and the layout version) – cache key for rendered reports."""
+    digest = hashlib.sha1(str(REPORT_LAYOUT_VERSION).encode())
+    digest.update(pd.util.hash_pandas_object(rows.reset_index(drop=True), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Rendered reports on disk, keyed by content hash; unchanged inspections are not re-rendered.
+
+    Bounded like ExportCache: `prune()` deletes the least recently used reports once
+    more than `max_entries` files or `max_bytes` are stored (hits refresh the file's
+    mtime), so reports of since-edited inspections do not pile up.
+    """
+
+    def __init__(self, root, max_entries: int = 5000, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.docx"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            payload = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:  # also: pruned by another process meanwhile
+            return None
+        return payload
+
+    def put(self, key: str, payload: bytes):
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+
+    def prune(self) -> int:
+        """Delete least recently used reports beyond the limits; returns the number deleted."""
+        entries = []
+        for path in self.root.glob("*.docx"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)
+        kept, size, removed = 0, 0, 0
+        for _, nbytes, path in entries:
+            if kept < self.max_entries and size + nbytes <= self.max_bytes:
+                kept += 1
+                size += nbytes
+            else:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+def _render(inspection_id: str, rows: pd.DataFrame) -> Tuple[str, bytes]:
+    # top-level so it can be pickled into worker processes
+    return inspection_id, build_inspection_report_docx(rows)
+
+
+def render_reports(rows: pd.DataFrame, cache: Optional[ReportCache] = None,
+                   max_workers: Optional[int] = None) -> Iterator[Tuple[str, bytes, bool]]:
+    """Yield (inspection_id, docx bytes, from_cache) for every inspection in the flat `rows`.
+
+    Cache hits are yielded first; the rest is rendered in a process pool and yielded
+    as soon as each report is done.
+    """
+    pending = []
+    for inspection_id, group in rows.groupby("inspection_id", sort=False):
+        key = content_hash(group)
+        payload = cache.get(key) if cache is not None else None
+        if payload is not None:
+            yield inspection_id, payload, True
+        else:
+            pending.append((key, inspection_id, group))
+    if not pending:
+        return
+    keys = {inspection_id: key for key, inspection_id, _ in pending}
+    if max_workers == 1 or len(pending) == 1:
+        results = (_render(i, g) for _, i, g in pending)
+        for inspection_id, payload in results:
+            if cache is not None:
+                cache.put(keys[inspection_id], payload)
+            yield inspection_id, payload, False
+        return
+    # spawn: the Streamlit server is multi-threaded, forking it is not safe
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+        futures = [pool.submit(_render, i, g) for _, i, g in pending]
+        for fut in as_completed(futures):
+            inspection_id, payload = fut.result()
+            if cache is not None:
+                cache.put(keys[inspection_id], payload)
+            yield inspection_id, payload, False
+
+
+def write_reports_zip(rows: pd.DataFrame, out, cache: Optional[ReportCache] = None,
+                      max_workers: Optional[int] = None,
+                      progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """Render reports for all inspections in `rows` into the ZIP file-like/path `out`.
+
+    Reports are written as they arrive, so only one rendered document is held at a
+    time. `progress(done, total)` is called after each report; returns the count.
+    """
+    total = rows["inspection_id"].nunique()
+    done = 0
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for inspection_id, payload, _ in render_reports(rows, cache=cache, max_workers=max_workers):
+            zf.writestr(f"Begehungsbericht_{inspection_id}.docx", payload)
+            done += 1
+            if progress is not None:
+                progress(done, total)
+    if cache is not None:
+        cache.prune()
+    return done
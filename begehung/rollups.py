@@ -0,0 +1,155 @@
+import threading
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .schema import STATUS_OPTIONS
+from .store import InspectionStore
+
+DIMENSIONS = {"item_group": "Gruppe", "technician": "Techniker*in", "city": "Stadt",
+              "variant_combo": "Variante(n)", "month": "Monat"}
+CUBE_KEYS = ["item_group", "technician", "city", "variant_combo", "month", "status"]
+VALUE_KEYS = ["item_group", "unit", "month"]
+NO_DATE = "ohne Datum"
+
+
+def _months(dates: pd.Series) -> pd.Series:
+    return dates.dt.strftime("%Y-%m").fillna(NO_DATE)
+
+
+def _text(col: pd.Series) -> pd.Series:
+    return col.astype("string").fillna("")
+
+
+class Rollups:
+    """Pre-aggregated reporting figures over an InspectionStore, updated on every append.
+
+    Three aggregates are kept as plain counters keyed by their dimensions:
+    item counts per (item_group, technician, city, variant_combo, month, status),
+    sums/counts of the parsed values per (item_group, canonical unit, month) and the open-item
+    backlog of the latest Begehung per Liegenschaftsnummer. Dashboard queries
+    group these (a few thousand keys) instead of rescanning the item table.
+    """
+
+    def __init__(self, store: InspectionStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._cube: Dict[Tuple, int] = {}
+        self._values: Dict[Tuple, List[float]] = {}
+        # liegenschaftsnummer -> [date (int64 ns), inspection_id, offen, kritisch]
+        self._backlog: Dict[str, list] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self.version = 0
+        with store._lock:
+            for batch, offset in store.iter_flat():
+                self._add(batch, offset)
+            store.subscribe(self._add)
+
+    def _add(self, batch: pd.DataFrame, offset: int):
+        # called by the store under its lock
+        keys = pd.DataFrame({c: _text(batch[c]) for c in CUBE_KEYS if c != "month"})
+        keys["month"] = _months(batch["date"])
+        counts = keys.groupby(CUBE_KEYS, sort=False).size()
+
+        # typed values from the store's parsing stage: canonical unit, float, error flag
+        numbers = pd.DataFrame({"item_group": keys["item_group"], "unit": _text(batch["value_unit"]),
+                                "month": keys["month"], "value": batch["value_num"].to_numpy(),
+                                "errors": batch["value_error"].to_numpy(dtype=np.int64)})
+        numbers = numbers[numbers["value"].notna().to_numpy() | (numbers["errors"] > 0).to_numpy()]
+        sums = numbers.groupby(VALUE_KEYS, sort=False).agg(sum=("value", "sum"), count=("value", "count"),
+                                                         errors=("errors", "sum"))
+
+        status = keys["status"]
+        per_inspection = pd.DataFrame({
+            "inspection_id": _text(batch["inspection_id"]),
+            "liegenschaftsnummer": _text(batch["liegenschaftsnummer"]),
+            "date": batch["date"].to_numpy(dtype="datetime64[ns]").view(np.int64),
+            "offen": (status == "offen").to_numpy(dtype=np.int64),
+            "kritisch": (status == "kritisch").to_numpy(dtype=np.int64),
+        }).groupby("inspection_id", sort=False).agg(
+            liegenschaftsnummer=("liegenschaftsnummer", "first"), date=("date", "first"),
+            offen=("offen", "sum"), kritisch=("kritisch", "sum"))
+
+        with self._lock:
+            cube = self._cube
+            for key, n in counts.items():
+                cube[key] = cube.get(key, 0) + int(n)
+            values = self._values
+            for key, (total, n, errors) in zip(sums.index, sums.itertuples(index=False, name=None)):
+                entry = values.setdefault(key, [0.0, 0, 0])
+                entry[0] += float(total)
+                entry[1] += int(n)
+                entry[2] += int(errors)
+            backlog = self._backlog
+            for inspection_id, lg, when, offen, kritisch in per_inspection.itertuples(name=None):
+                if not lg:
+                    continue
+                entry = backlog.get(lg)
+                if entry is not None and entry[1] == inspection_id:
+                    entry[2] += int(offen)
+                    entry[3] += int(kritisch)
+                elif entry is None or when >= entry[0]:
+                    # a newer Begehung of the property replaces the older backlog
+                    backlog[lg] = [int(when), inspection_id, int(offen), int(kritisch)]
+            self._frames.clear()
+            self.version += 1
+
+    # ---- materialised aggregates (cached until the next append) ----
+    def _frame(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            frame = self._frames.get(name)
+            if frame is not None:
+                return frame
+            if name == "cube":
+                frame = pd.DataFrame(list(self._cube), columns=CUBE_KEYS)
+                frame["count"] = np.fromiter(self._cube.values(), dtype=np.int64, count=len(self._cube))
+            elif name == "values":
+                frame = pd.DataFrame(list(self._values), columns=VALUE_KEYS)
+                totals = np.array(list(self._values.values()), dtype=float).reshape(-1, 3)
+                frame["sum"] = totals[:, 0]
+                frame["count"], frame["errors"] = totals[:, 1].astype(np.int64), totals[:, 2].astype(np.int64)
+            else:
+                rows = [(lg, *entry) for lg, entry in self._backlog.items()]
+                frame = pd.DataFrame(rows, columns=["liegenschaftsnummer", "date", "inspection_id", "offen", "kritisch"])
+                frame["date"] = frame["date"].to_numpy(dtype=np.int64).view("datetime64[ns]")  # int64 min is NaT
+            self._frames[name] = frame
+            return frame
+
+    def status_counts(self, by: Union[str, Sequence[str]] = "item_group", **filters: str) -> pd.DataFrame:
+        """Item counts per status (columns) for each value of the `by` dimension(s).
+
+        `filters` restrict exact dimension values, e.g. status_counts("technician", month="2025-03").
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        cube = self._frame("cube")
+        for col, value in filters.items():
+            cube = cube[cube[col] == value]
+        table = (cube.groupby(by + ["status"], sort=False)["count"].sum()
+                 .unstack("status", fill_value=0).reindex(columns=STATUS_OPTIONS, fill_value=0))
+        table.columns.name = None
+        table["gesamt"] = table.sum(axis=1)
+        return table.sort_index()
+
+    def value_sums(self, by: Union[str, Sequence[str]] = "unit", **filters: str) -> pd.DataFrame:
+        """Sum and count of numeric values (canonical unit) plus unreadable values per `by` (item_group, unit, month)."""
+        by = [by] if isinstance(by, str) else list(by)
+        values = self._frame("values")
+        for col, value in filters.items():
+            values = values[values[col] == value]
+        return values.groupby(by)[["sum", "count", "errors"]].sum().sort_index()
+
+    def backlog(self, min_open: int = 1) -> pd.DataFrame:
+        """Open and critical items of the latest Begehung per Liegenschaftsnummer, most critical first."""
+        frame = self._frame("backlog")
+        frame = frame[frame["offen"] + frame["kritisch"] >= min_open]
+        return frame.sort_values(["kritisch", "offen", "liegenschaftsnummer"],
+                                 ascending=[False, False, True]).reset_index(drop=True)
+
+    def months(self) -> List[str]:
+        return sorted(set(self._frame("cube")["month"]))
+
+    def totals(self) -> pd.Series:
+        """Item counts per status over everything stored."""
+        cube = self._frame("cube")
+        return cube.groupby("status")["count"].sum().reindex(STATUS_OPTIONS, fill_value=0)
@@ -0,0 +1,35 @@
+import pandas as pd
+
+# Flat row layout of a Begehung (one row per checklist item), as used for CSV/XLSX
+COLUMNS = [
+    "inspection_id","date","technician","customer_name","customer_email","customer_phone",
+    "address","city","plz","bundesland","liegenschaftsnummer",
+    "variant_combo","item_id","item_group","item_text","status","value","unit","notes"
+]
+# Normalised model: one header per inspection, items reference it and the template-item dictionary
+HEADER_FIELDS = [
+    "inspection_id","date","technician","customer_name","customer_email","customer_phone",
+    "address","city","plz","bundesland","liegenschaftsnummer","variant_combo"
+]
+ITEM_FIELDS = ["item_group","item_text","status","value","unit","notes"]
+STATUS_OPTIONS = ["ok","offen","kritisch","n/a"]
+STATUS_DTYPE = pd.CategoricalDtype(STATUS_OPTIONS)
+TEXT_COLUMNS = [c for c in COLUMNS if c not in ("date", "status")]
+
+
+def empty_frame() -> pd.DataFrame:
+    return conform(pd.DataFrame(columns=COLUMNS))
+
+
+def conform(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with exactly COLUMNS in order and stable dtypes.
+
+    date → datetime64, status → categorical (STATUS_OPTIONS, anything else becomes NA),
+    everything else → string.
+    """
+    out = df.reindex(columns=COLUMNS)
+    out["date"] = pd.to_datetime(out["date"], errors="coerce")
+    out["status"] = out["status"].astype("string").astype(STATUS_DTYPE)
+    for c in TEXT_COLUMNS:
+        out[c] = out[c].astype("string")
+    return out.reset_index(drop=True)
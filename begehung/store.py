@@ -0,0 +1,440 @@
+import json
+import os
+import re
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .schema import COLUMNS, HEADER_FIELDS, STATUS_DTYPE, conform
+from .values import PARSED_COLUMNS, parse_values
+
+SEGMENT_RE = re.compile(r"^seg-(\d{6})-(\d{6})\.parquet$")
+PARTS_KEY = b"begehung.parts"  # compacted segments: [[first, last, rows], …] in row order
+KEY_COLUMNS = ["inspection_id", "item_id"]
+ITEM_TABLE_COLUMNS = ["header", "item_id", "template_item", "status", "value", "unit", "notes"] + PARSED_COLUMNS
+
+
+def row_keys(df: pd.DataFrame) -> list:
+    """(inspection_id, item_id) per row – the identity used for de-duplication."""
+    return list(zip(df["inspection_id"].fillna(""), df["item_id"].fillna("")))
+
+
+def _concat(chunks: List[pd.DataFrame], empty: pd.DataFrame) -> pd.DataFrame:
+    if not chunks:
+        return empty
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _segment_parts(path: Path) -> Optional[list]:
+    import pyarrow.parquet as pq
+    raw = (pq.read_schema(path).metadata or {}).get(PARTS_KEY)
+    return json.loads(raw) if raw else None
+
+
+class TemplateItemDictionary:
+    """Integer keys for (item_group, item_text) – checklist texts are stored once, not per row."""
+
+    def __init__(self):
+        self._lookup: Dict[Tuple, int] = {}
+        self.groups: List[Optional[str]] = []
+        self.texts: List[Optional[str]] = []
+
+    def __len__(self):
+        return len(self.texts)
+
+    def encode(self, groups: pd.Series, texts: pd.Series) -> np.ndarray:
+        codes = np.empty(len(texts), dtype=np.int32)
+        g_vals = groups.astype(object).where(groups.notna(), None)
+        t_vals = texts.astype(object).where(texts.notna(), None)
+        for i, key in enumerate(zip(g_vals, t_vals)):
+            code = self._lookup.get(key)
+            if code is None:
+                code = self._lookup[key] = len(self.texts)
+                self.groups.append(key[0])
+                self.texts.append(key[1])
+            codes[i] = code
+        return codes
+
+    def decode(self, codes: np.ndarray) -> Tuple[pd.Series, pd.Series]:
+        groups = np.asarray(self.groups + [None], dtype=object)[codes]
+        texts = np.asarray(self.texts + [None], dtype=object)[codes]
+        return pd.Series(groups, dtype="string"), pd.Series(texts, dtype="string")
+
+
+class InspectionStore:
+    """Append-only store for Begehungen.
+
+    In memory the data is normalised: one header row per inspection (customer,
+    object, technician …), one item row per checklist point referencing its header
+    and a shared TemplateItemDictionary. The flat one-row-per-item layout (COLUMNS)
+    is only materialised on demand – for exports, the reporting view and the
+    Parquet segments (`seg-<first>-<last>.parquet` below `root`), which keeps the
+    on-disk format identical to the CSV layout. Without `root` the store is memory-only.
+
+    Header fields of an inspection are taken from the first batch that mentions it;
+    later rows for the same inspection_id only add items. `value`/`unit` are parsed
+    once when rows come in (begehung.values); the typed PARSED_COLUMNS live next to
+    the raw text in the item table and are recomputed, not persisted.
+
+    Segments are merged size-tiered: after an append the newest segments are
+    rewritten into one as soon as a segment is no larger than `merge_ratio` times
+    everything written after it. That keeps O(log n) files and rewrites each row
+    O(log n) times; merging streams the Parquet files and never touches memory.
+
+    With a `backend` (begehung.backend.Backend) several processes can share `root`:
+    segment numbers come from the database, every append is logged there, and
+    refresh() loads what other processes appended since the last call.
+    """
+
+    def __init__(self, root=None, merge_ratio: float = 2.0, backend=None):
+        if backend is not None and not root:
+            raise ValueError("Ein gemeinsames Backend braucht ein Datenverzeichnis (root).")
+        self.root = Path(root) if root else None
+        self.backend = backend
+        self.merge_ratio = merge_ratio
+        self._lock = threading.RLock()
+        self.template_items = TemplateItemDictionary()
+        self._header_chunks: List[pd.DataFrame] = []
+        self._item_chunks: List[pd.DataFrame] = []
+        self._header_pos: Dict[str, int] = {}
+        self._segment_rows: Dict[str, int] = {}  # file name -> rows, read from the Parquet footer once
+        self._loaded: set = set()
+        self._seen_change = 0
+        self._keys: Optional[set] = None
+        self._listeners: List[Callable[[pd.DataFrame, int], None]] = []
+        self._rows = 0
+        self._next_seq = 1
+        self.version = 0
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # under the write lock so no other process compacts while we read
+            with self._writing() as conn:
+                if conn is not None:
+                    self._seen_change = self.backend.last_change("inspections", conn)
+                self._load()
+
+    # ---- persistence ----
+    def _writing(self):
+        return self.backend.transaction() if self.backend is not None else nullcontext()
+
+    def _disk_segments(self) -> List[Tuple[int, int, Path]]:
+        """(first, last, path) of the live segments in sequence order."""
+        found = []
+        for p in self.root.iterdir():
+            m = SEGMENT_RE.match(p.name)
+            if m:
+                found.append((int(m.group(1)), -int(m.group(2)), p))
+        # A merged segment covers [first, last]; anything inside that range is stale
+        live, covered = [], 0
+        for first, neg_last, p in sorted(found):
+            last = -neg_last
+            if last <= covered:
+                p.unlink(missing_ok=True)
+                self._segment_rows.pop(p.name, None)
+                continue
+            live.append((first, last, p))
+            covered = last
+        return live
+
+    def _rows_of(self, path: Path) -> int:
+        rows = self._segment_rows.get(path.name)
+        if rows is None:
+            import pyarrow.parquet as pq
+            rows = self._segment_rows[path.name] = pq.read_metadata(path).num_rows
+        return rows
+
+    def _load(self):
+        segments = self._disk_segments()
+        for first, last, p in segments:
+            batch = conform(pd.read_parquet(p))
+            self._add(batch)
+            self._segment_rows[p.name] = len(batch)
+            self._track((first != last and _segment_parts(p)) or [[first, last, len(batch)]])
+        self._next_seq = segments[-1][1] + 1 if segments else 1
+
+    def _track(self, parts: List[list]):
+        for first, last, _ in parts:
+            self._loaded.update(range(first, last + 1))
+
+    def _write_segment(self, df: pd.DataFrame, seq: int) -> Path:
+        path = self.root / f"seg-{seq:06d}-{seq:06d}.parquet"
+        tmp = path.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        self._segment_rows[path.name] = len(df)
+        return path
+
+    def _merge(self, segments: List[Tuple[int, int, Path]]) -> Path:
+        """Stream `segments` (consecutive) into one file; its metadata lists the merged parts."""
+        import pyarrow.parquet as pq
+        first, last = segments[0][0], segments[-1][1]
+        parts = []
+        for f, l, p in segments:
+            parts.extend((f != l and _segment_parts(p)) or [[f, l, self._rows_of(p)]])
+        path = self.root / f"seg-{first:06d}-{last:06d}.parquet"
+        tmp = path.with_suffix(".tmp")
+        schema = pq.read_schema(segments[0][2])
+        schema = schema.with_metadata({**(schema.metadata or {}), PARTS_KEY: json.dumps(parts).encode()})
+        with pq.ParquetWriter(tmp, schema) as writer:
+            for _, _, p in segments:  # one segment in memory at a time
+                writer.write_table(pq.read_table(p).cast(schema))
+        os.replace(tmp, path)
+        self._segment_rows[path.name] = sum(rows for _, _, rows in parts)
+        for _, _, p in segments:
+            p.unlink(missing_ok=True)
+            self._segment_rows.pop(p.name, None)
+        return path
+
+    def _merge_tail(self):
+        # size-tiered: merge from the oldest segment that is <= merge_ratio × all rows after it
+        segments = self._disk_segments()
+        rows = [self._rows_of(p) for _, _, p in segments]
+        after, start = 0, len(segments)
+        for i in range(len(segments) - 1, -1, -1):
+            if i < len(segments) - 1 and rows[i] <= self.merge_ratio * after:
+                start = i
+            after += rows[i]
+        if start < len(segments) - 1:
+            self._merge(segments[start:])
+
+    def _read_segment(self, seq: int) -> Tuple[pd.DataFrame, Path]:
+        path = self.root / f"seg-{seq:06d}-{seq:06d}.parquet"
+        if path.exists():
+            return conform(pd.read_parquet(path)), path
+        # compacted by another process in the meantime: cut the rows out of the covering segment
+        import pyarrow.parquet as pq
+        for p in self.root.iterdir():
+            m = SEGMENT_RE.match(p.name)
+            if not m or not int(m.group(1)) <= seq <= int(m.group(2)):
+                continue
+            start = 0
+            for first, last, rows in _segment_parts(p) or []:
+                if first == seq:
+                    return conform(pq.read_table(p).slice(start, rows).to_pandas()), p
+                start += rows
+        raise FileNotFoundError(f"Segment {seq} fehlt in {self.root}")
+
+    def refresh(self) -> int:
+        """Load segments other processes appended since the last call; returns the number of new rows.
+
+        Without changes this is a single indexed query, cheap enough for every rerun.
+        """
+        if self.backend is None or self.backend.last_change("inspections") <= self._seen_change:
+            return 0
+        with self._lock, self.backend.transaction() as conn:
+            return self._refresh(conn)
+
+    def _refresh(self, conn) -> int:
+        rows = 0
+        for change in self.backend.changes_since(self._seen_change, "inspections", conn):
+            seq = int(change.ref)
+            if seq not in self._loaded:
+                batch, _ = self._read_segment(seq)
+                rows += len(self._publish(batch, seq))
+            self._seen_change = change.seq
+        return rows
+
+    def compact(self):
+        """Merge all on-disk segments into one and collapse the in-memory chunks."""
+        with self._lock, self._writing():
+            self.headers()
+            self.items()
+            if self.root is not None:
+                segments = self._disk_segments()
+                if len(segments) > 1:
+                    self._merge(segments)
+
+    # ---- write ----
+    def _add(self, batch: pd.DataFrame) -> pd.DataFrame:
+        # normalise a conformed flat batch into header/item chunks; returns the batch as stored
+        ids = batch["inspection_id"].fillna("")
+        firsts = batch.loc[~ids.duplicated().to_numpy()]
+        new = firsts.loc[[i not in self._header_pos for i in ids[firsts.index]]][HEADER_FIELDS].reset_index(drop=True)
+        n_before = len(self._header_pos)
+        if len(new):
+            for offset, i in enumerate(new["inspection_id"].fillna("")):
+                self._header_pos[i] = n_before + offset
+            self._header_chunks.append(new)
+        header_rows = ids.map(self._header_pos).to_numpy(dtype=np.int32)
+        parsed = parse_values(batch["value"], batch["unit"])
+        items = pd.DataFrame({
+            "header": header_rows,
+            "item_id": batch["item_id"].array,
+            "template_item": self.template_items.encode(batch["item_group"], batch["item_text"]),
+            "status": batch["status"].array,
+            "value": batch["value"].array,
+            "unit": batch["unit"].array,
+            "notes": batch["notes"].array,
+            **{c: parsed[c].array for c in PARSED_COLUMNS},
+        })
+        self._item_chunks.append(items)
+        self._rows += len(items)
+        # header fields as stored: first occurrence wins, existing inspections keep theirs
+        if (header_rows >= n_before).all():
+            source, rows = new, header_rows - n_before
+        else:
+            source, rows = self.headers(), header_rows
+        stored = batch.copy()
+        for f in HEADER_FIELDS:
+            stored[f] = source[f].take(rows).array
+        for c in PARSED_COLUMNS:
+            stored[c] = parsed[c].array
+        return stored
+
+    def append(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add a batch of flat rows; returns the batch as stored (conformed, header fields
+        resolved, PARSED_COLUMNS added)."""
+        batch = conform(df)
+        if batch.empty:
+            return batch
+        with self._lock, self._writing() as conn:
+            return self._append(batch, conn)
+
+    def _append(self, batch: pd.DataFrame, conn) -> pd.DataFrame:
+        if conn is not None:
+            # catch up first so positions and the key index include other processes' rows
+            self._refresh(conn)
+            seq = self.backend.allocate_segment(conn, len(batch), floor=self._next_seq - 1)
+        else:
+            seq = self._next_seq
+        if self.root is not None:
+            self._write_segment(batch, seq)
+        if conn is not None:
+            self.backend.record_change(conn, "inspections", str(seq))
+        self._next_seq = seq + 1
+        batch = self._publish(batch, seq)
+        if self.root is not None:
+            self._merge_tail()
+        return batch
+
+    def _publish(self, batch: pd.DataFrame, seq: int) -> pd.DataFrame:
+        offset = self._rows
+        batch = self._add(batch)
+        self._track([[seq, seq, len(batch)]])
+        if self._keys is not None:
+            self._keys.update(row_keys(batch))
+        self.version += 1
+        for listener in self._listeners:
+            listener(batch, offset)
+        return batch
+
+    def merge(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Append only rows whose (inspection_id, item_id) is not stored yet.
+
+        Duplicates are detected against a key index that is maintained on every
+        append, so the cost depends on the size of `df`, not of the store.
+        """
+        batch = conform(df)
+        with self._lock, self._writing() as conn:
+            if conn is not None:
+                self._refresh(conn)
+            known = self._key_index()
+            keys = row_keys(batch)
+            fresh, seen = [], set()
+            for k in keys:
+                fresh.append(k not in known and k not in seen)
+                seen.add(k)
+            batch = batch.loc[fresh]
+            return self._append(batch, conn) if len(batch) else batch
+
+    def subscribe(self, listener: Callable[[pd.DataFrame, int], None]):
+        """Call `listener(batch, offset)` after every append (incl. rows picked up by refresh());
+        `offset` is the item position of the batch."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _key_index(self) -> set:
+        # built lazily on first merge, kept up to date by append()
+        if self._keys is None:
+            self._keys = set(row_keys(self.flat(columns=KEY_COLUMNS)))
+        return self._keys
+
+    # ---- read ----
+    def headers(self) -> pd.DataFrame:
+        """One row per inspection (HEADER_FIELDS); row position = `header` key of the item table."""
+        with self._lock:
+            frame = _concat(self._header_chunks, conform(pd.DataFrame())[HEADER_FIELDS])
+            self._header_chunks = [frame] if len(frame) else []
+            return frame
+
+    def items(self) -> pd.DataFrame:
+        """One row per checklist point (ITEM_TABLE_COLUMNS)."""
+        with self._lock:
+            empty = pd.DataFrame({
+                "header": np.empty(0, dtype=np.int32), "item_id": pd.array([], dtype="string"),
+                "template_item": np.empty(0, dtype=np.int32), "status": pd.Categorical([], dtype=STATUS_DTYPE),
+                "value": pd.array([], dtype="string"), "unit": pd.array([], dtype="string"),
+                "notes": pd.array([], dtype="string"),
+                "value_num": np.empty(0, dtype=np.float64), "value_unit": pd.array([], dtype="string"),
+                "value_error": np.empty(0, dtype=bool),
+            })
+            frame = _concat(self._item_chunks, empty)
+            self._item_chunks = [frame] if len(frame) else []
+            return frame
+
+    def flat(self, positions: Optional[Sequence[int]] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Materialise item rows at `positions` (default: all) in the flat COLUMNS layout.
+
+        The result is a new frame indexed by item position; pass `columns` to only
+        build the columns you need (PARSED_COLUMNS are available too).
+        """
+        columns = list(columns or COLUMNS)
+        with self._lock:
+            headers, items = self.headers(), self.items()
+            template_items = self.template_items
+            if positions is None:
+                positions = np.arange(len(items))
+            positions = np.asarray(positions, dtype=np.int64)
+            items = items.take(positions)
+            header_rows = items["header"].to_numpy()
+            groups, texts = template_items.decode(items["template_item"].to_numpy())
+        out = {}
+        for c in columns:
+            if c in HEADER_FIELDS:
+                out[c] = headers[c].take(header_rows).array
+            elif c == "item_group":
+                out[c] = groups.array
+            elif c == "item_text":
+                out[c] = texts.array
+            else:
+                out[c] = items[c].array
+        return pd.DataFrame(out, index=pd.Index(positions))  # dict order = `columns`; no columns= (it boxes to object)
+
+    def frame(self) -> pd.DataFrame:
+        """Full flat table. Built on every call – prefer flat() with positions/columns."""
+        return self.flat().reset_index(drop=True)
+
+    def iter_flat(self, batch_rows: int = 100_000) -> Iterator[Tuple[pd.DataFrame, int]]:
+        """Yield (batch, offset) over all stored rows without materialising the full table.
+
+        Batches have the same columns as those passed to subscribers (COLUMNS + PARSED_COLUMNS).
+        """
+        total = self._rows
+        columns = COLUMNS + PARSED_COLUMNS
+        for start in range(0, total, batch_rows):
+            yield self.flat(np.arange(start, min(start + batch_rows, total)), columns).reset_index(drop=True), start
+
+    def inspection(self, inspection_id: str) -> pd.DataFrame:
+        """Flat rows of one inspection."""
+        return self.select_inspections([inspection_id])
+
+    def select_inspections(self, inspection_ids: Iterable[str]) -> pd.DataFrame:
+        """Flat rows of the given inspections, found in a single pass over the item table."""
+        with self._lock:
+            wanted = [self._header_pos[i] for i in inspection_ids if i in self._header_pos]
+            header = self.items()["header"].to_numpy()
+            return self.flat(np.flatnonzero(np.isin(header, wanted)))
+
+    def inspection_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._header_pos)
+
+    def __len__(self):
+        return self._rows
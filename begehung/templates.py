@@ -0,0 +1,164 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+VARIANTS = ["Bronze", "Silber", "Gold"]
+FORM_COLUMNS = ["item_group", "item_text", "status", "value", "unit", "notes"]
+
+
+@dataclass(frozen=True)
+class ChecklistItem:
+    item_group: str
+    item_text: str
+    unit: str = ""
+    default: str = "offen"
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.item_group, self.item_text)
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledChecklist:
+    """Deduplicated checklist for one variant combination (first occurrence wins)."""
+    version: str
+    variants: Tuple[str, ...]
+    items: Tuple[ChecklistItem, ...]
+    groups: Tuple[Tuple[str, Tuple[ChecklistItem, ...]], ...]
+
+    def __len__(self):
+        return len(self.items)
+
+    def frame(self, prefill: Optional[dict] = None) -> pd.DataFrame:
+        """Form rows for st.data_editor; `prefill` maps (group, text) → (value, unit override).
+
+        Cached per checklist and prefill – treat the result as read-only.
+        """
+        prefill_items = tuple(sorted((prefill or {}).items()))
+        return _form_frame(self, prefill_items)
+
+
+def template_version(templates: Dict[str, List[dict]]) -> str:
+    payload = json.dumps(templates, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _clean(value, fallback: str = "") -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return fallback
+    return str(value)
+
+
+def _normalise(records: Iterable[dict]) -> List[dict]:
+    # rows added in the editor may be incomplete; rows without Prüfpunkt are dropped
+    out = []
+    for r in records:
+        text = _clean(r.get("item_text")).strip()
+        if not text:
+            continue
+        out.append({
+            "item_group": _clean(r.get("item_group")),
+            "item_text": text,
+            "unit": _clean(r.get("unit")),
+            "default": _clean(r.get("default"), "offen") or "offen",
+        })
+    return out
+
+
+_CACHE_SIZE = 128
+_compiled: "OrderedDict[tuple, CompiledChecklist]" = OrderedDict()
+_frames: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _remember(cache: OrderedDict, key, value):
+    cache[key] = value
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
+def compile_checklist(templates: Dict[str, List[dict]], variants: Iterable[str],
+                      version: Optional[str] = None) -> CompiledChecklist:
+    """Resolve `variants` against `templates` once; memoised by (template version, variants)."""
+    version = version or template_version(templates)
+    variants = tuple(variants)
+    key = (version, variants)
+    with _cache_lock:
+        hit = _compiled.get(key)
+        if hit is not None:
+            _compiled.move_to_end(key)
+            return hit
+    seen = set()
+    items = []
+    for v in variants:
+        for it in templates.get(v, []):
+            item = ChecklistItem(it["item_group"], it["item_text"], it.get("unit", "") or "", it.get("default", "offen") or "offen")
+            if item.key in seen:
+                continue
+            seen.add(item.key)
+            items.append(item)
+    groups: Dict[str, List[ChecklistItem]] = {}
+    for item in items:
+        groups.setdefault(item.item_group, []).append(item)
+    compiled = CompiledChecklist(version, variants, tuple(items),
+                                 tuple((g, tuple(its)) for g, its in groups.items()))
+    with _cache_lock:
+        return _remember(_compiled, key, compiled)
+
+
+def _form_frame(checklist: CompiledChecklist, prefill_items: tuple) -> pd.DataFrame:
+    key = (checklist.version, checklist.variants, prefill_items)
+    with _cache_lock:
+        hit = _frames.get(key)
+        if hit is not None:
+            _frames.move_to_end(key)
+            return hit
+    prefill = dict(prefill_items)
+    rows = []
+    for item in checklist.items:
+        val, unit = "", item.unit
+        if item.key in prefill:
+            val, unit_override = prefill[item.key]
+            if unit_override:
+                unit = unit_override
+        rows.append((item.item_group, item.item_text, item.default, val, unit, ""))
+    frame = pd.DataFrame.from_records(rows, columns=FORM_COLUMNS)
+    with _cache_lock:
+        return _remember(_frames, key, frame)
+
+
+class TemplateCatalog:
+    """Checklist templates per variant plus their content version.
+
+    A catalog is immutable: saving a template goes through `SharedTemplates.save`,
+    which builds a new catalog, so compiled checklists stay valid until then.
+    """
+
+    def __init__(self, templates: Dict[str, List[dict]]):
+        self._templates = {v: _normalise(items) for v, items in copy.deepcopy(templates).items()}
+        self.version = template_version(self._templates)
+
+    @property
+    def templates(self) -> Dict[str, List[dict]]:
+        return self._templates
+
+    def variants(self) -> List[str]:
+        return list(self._templates.keys())
+
+    def items(self, variant: str) -> List[dict]:
+        return list(self._templates.get(variant, []))
+
+    def compile(self, variants: Iterable[str]) -> CompiledChecklist:
+        return compile_checklist(self._templates, variants, version=self.version)
+
+    def compile_all(self) -> CompiledChecklist:
+        """All variants in canonical order – used for the Blanko-Formular."""
+        return self.compile([v for v in VARIANTS if v in self._templates] +
+                            [v for v in self._templates if v not in VARIANTS])
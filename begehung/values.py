@@ -0,0 +1,83 @@
+"""Typed measurement values: German/English number formats and canonical units."""
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+PARSED_COLUMNS = ["value_num", "value_unit", "value_error"]
+
+# alias (lowercase, without blanks) -> (canonical unit, factor to the canonical unit)
+UNIT_ALIASES: Dict[str, Tuple[str, float]] = {
+    "kwp": ("kWp", 1), "wp": ("kWp", 1e-3), "mwp": ("kWp", 1e3),
+    "kw": ("kW", 1), "w": ("kW", 1e-3), "mw": ("kW", 1e3),
+    "kwh": ("kWh", 1), "wh": ("kWh", 1e-3), "mwh": ("kWh", 1e3),
+    "kwh/a": ("kWh/a", 1), "kwh/jahr": ("kWh/a", 1), "kwh/j": ("kWh/a", 1), "kwhp.a.": ("kWh/a", 1),
+    "kwha": ("kWh/a", 1), "mwh/a": ("kWh/a", 1e3), "mwh/jahr": ("kWh/a", 1e3), "mwhp.a.": ("kWh/a", 1e3),
+    "€": ("€", 1), "eur": ("€", 1), "euro": ("€", 1), "t€": ("€", 1e3), "teur": ("€", 1e3), "tsd.€": ("€", 1e3),
+    "ct/kwh": ("ct/kWh", 1), "€/kwh": ("ct/kWh", 100), "eur/kwh": ("ct/kWh", 100),
+    "m²": ("m²", 1), "m2": ("m²", 1), "qm": ("m²", 1),
+    "kva": ("kVA", 1), "a": ("A", 1), "v": ("V", 1), "%": ("%", 1),
+}
+
+# "30", "30 kWp", "1.234,5 €", "ca. 2500" – number first, optional unit (letter, currency, % or °) after it
+_PREFIX = r"^(?:ca\.?|~|≈)?\s*"
+_VALUE_RE = _PREFIX + r"([-+]?\d[\d.,' ]*)\s*((?:[^\W\d_]|[€$%°]).*)?$"
+
+
+def _numbers(text: pd.Series) -> pd.Series:
+    num = text.str.replace(r"[ ']", "", regex=True)
+    has_comma = num.str.contains(",", regex=False).fillna(False)
+    english = has_comma & (num.str.rfind(".") > num.str.rfind(",")).fillna(False)
+    # "1.234,5" (German): dots group thousands, the comma is the decimal mark
+    num = num.mask(has_comma & ~english, num.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    # "1,234.5" (English): commas group thousands
+    num = num.mask(english, num.str.replace(",", "", regex=False))
+    # "28.500" without a comma: dots in groups of three are thousands separators ("0.500" is not)
+    grouped = ~has_comma & num.str.fullmatch(r"[-+]?[1-9]\d{0,2}(?:\.\d{3})+").fillna(False)
+    num = num.mask(grouped, num.str.replace(".", "", regex=False))
+    return pd.to_numeric(num, errors="coerce").astype(np.float64)
+
+
+def canonical_unit(unit: str) -> Tuple[str, float]:
+    """(canonical unit, factor) for a unit as typed; unknown units are kept as they are."""
+    unit = (unit or "").strip()
+    return UNIT_ALIASES.get(unit.lower().replace(" ", ""), (unit, 1.0))
+
+
+def _resolve(units: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    # canonical units/factors, resolved once per distinct spelling
+    codes, spellings = pd.factorize(units.to_numpy(dtype=object))
+    resolved = [canonical_unit(u) for u in spellings]
+    canonical = np.array([r[0] for r in resolved] or [""], dtype=object)[codes]
+    factor = np.array([r[1] for r in resolved] or [1.0], dtype=np.float64)[codes]
+    return canonical, factor
+
+
+def parse_values(values: pd.Series, units: pd.Series) -> pd.DataFrame:
+    """Typed view of the free-text `value`/`unit` columns (PARSED_COLUMNS).
+
+    value_num   float in the canonical unit (NaN if empty or not a number)
+    value_unit  canonical unit; a unit typed in the value text ("0,75 MWp") wins over `unit`
+    value_error True where a value is not a number although the item has a unit or the
+                text starts like one ("2024-05-01", "12 -"), or where the unit in the text
+                does not match the item's unit ("500 W" for kWp)
+
+    Works column-wise; units are resolved once per distinct spelling.
+    """
+    text = values.astype("string").str.replace("\u00a0", " ", regex=False).str.strip()
+    parts = text.str.extract(_VALUE_RE)
+    number = _numbers(parts[0])
+    column_unit, column_factor = _resolve(units.astype("string").str.strip().fillna(""))
+    text_unit, text_factor = _resolve(parts[1].str.strip().fillna(""))
+    typed = text_unit != ""
+    canonical = np.where(typed, text_unit, column_unit)
+    factor = np.where(typed, text_factor, column_factor)
+    mismatch = typed & (column_unit != "") & (text_unit != column_unit)
+    given = text.fillna("").ne("").to_numpy()
+    looks_numeric = text.str.match(_PREFIX + r"[-+]?\d").fillna(False).to_numpy(dtype=bool)
+    number = number.to_numpy() * factor
+    return pd.DataFrame({
+        "value_num": number,
+        "value_unit": pd.array(canonical, dtype="string"),
+        "value_error": mismatch | (given & np.isnan(number) & ((canonical != "") | looks_numeric)),
+    }, index=values.index)
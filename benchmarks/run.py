@@ -0,0 +1,243 @@
+"""Benchmarks for the hot paths: save, CSV merge, reporting filter/sort, dashboard, XLSX export, Blanko-Formular.
+
+    python -m benchmarks.run --inspections 20000 --out bench.json
+    python -m benchmarks.run --baseline bench_old.json   # exit code 1 on regressions
+
+Each benchmark reports wall time (min/median/mean/p99/max over at least --repeat runs,
+short ones repeated for --min-time seconds; best of --rounds suite runs) and the peak Python heap allocation of one
+extra run measured with tracemalloc. The save benchmark runs until the size-tiered
+merge has rewritten the pre-filled segment once, so its p99/max include the merge
+stalls. A slowdown only counts as a regression if it exceeds --threshold and the
+run-to-run noise (see compare()).
+"""
+import argparse
+import itertools
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from begehung.defaults import DEFAULT_TEMPLATES
+from begehung.export import to_xlsx_bytes
+from begehung.ingest import import_csv
+from begehung.query import InspectionIndex
+from begehung.records import build_batch
+from begehung.rollups import Rollups
+from begehung.reports import DOCX_OK, build_blank_form_docx
+from begehung.store import InspectionStore
+from begehung.templates import TemplateCatalog
+
+from .synthetic import generate, generate_frame
+
+MIN_DELTA_SECONDS = 0.001  # differences below this are timer jitter
+MAX_REPEAT = 1000
+
+FILTERS = [
+    {},
+    {"technician": "team süd"},
+    {"city": "frei", "status": "kritisch"},
+    {"variant": "gold"},
+    {"technician": "team", "city": "köln", "status": "offen", "variant": "bronze+silber"},
+    {"unit": "kWp", "value_min": 20, "value_max": 40},
+]
+
+
+def measure(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None,
+            min_seconds: float = 0.0) -> Dict[str, float]:
+    """Time `fn` at least `repeat` times and until `min_seconds` of samples (max MAX_REPEAT) are collected."""
+    times = []
+    while len(times) < repeat or (sum(times) < min_seconds and len(times) < MAX_REPEAT):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    ranked = sorted(times)
+    return {
+        "seconds_min": ranked[0],
+        "seconds_median": statistics.median(ranked),
+        "seconds_mean": statistics.fmean(ranked),
+        "seconds_p99": ranked[math.ceil(0.99 * len(ranked)) - 1],
+        "seconds_max": ranked[-1],
+        "peak_bytes": peak,
+        "repeat": len(times),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(n_inspections: int, repeat: int, seed: int, xlsx_rows: int, min_time: float = 0.5,
+        rounds: int = 3) -> dict:
+    """Run the suite `rounds` times and keep, per benchmark, the round with the fastest run.
+
+    Load bursts on the machine tend to last longer than one benchmark, so they skew
+    every sample of a round; they rarely hit the same benchmark in all rounds.
+    """
+    best: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="begehung-bench-") as tmp:
+        for i in range(rounds):
+            workdir = Path(tmp) / f"round-{i}"
+            workdir.mkdir()
+            report = _run(workdir, n_inspections, repeat, seed, xlsx_rows, min_time)
+            for name, result in report["results"].items():
+                if name not in best or result["seconds_min"] < best[name]["seconds_min"]:
+                    best[name] = result
+    report["results"] = best
+    report["meta"]["rounds"] = rounds
+    return report
+
+
+def _run(workdir: Path, n_inspections: int, repeat: int, seed: int, xlsx_rows: int, min_time: float) -> dict:
+    results = {}
+    base = generate_frame(n_inspections, seed=seed)
+    new = generate(50, seed=seed + 1)
+
+    # --- save handler: build_batch + append (incl. Parquet segment) into a filled store.
+    # Enough saves that the tail outgrows base / merge_ratio, i.e. the big merge happens at least once.
+    store = InspectionStore(workdir / "save")
+    store.append(base)
+    per_save = statistics.fmean(len(items) for _, items in new)
+    n_saves = max(repeat, math.ceil(len(base) / (store.merge_ratio * per_save)) + 1)
+    saves = itertools.cycle(new)
+    def save_one():
+        header, items = next(saves)
+        store.append(build_batch(header, items))
+    results["save"] = measure(save_one, n_saves)
+
+    # --- CSV upload merge: half of the upload is already stored
+    upload = pd.concat([base.head(len(base) // 4), generate_frame(n_inspections // 4, seed=seed + 2)])
+    csv_path = workdir / "upload.csv"
+    upload.to_csv(csv_path, index=False)
+    holder = {}
+    def fresh_store():
+        holder["store"] = InspectionStore()
+        holder["store"].append(base)
+    results["csv_merge"] = measure(lambda: import_csv(csv_path, holder["store"]), repeat, setup=fresh_store,
+                                   min_seconds=min_time)
+    results["csv_merge"]["rows"] = len(upload)
+
+    # --- reporting page: index build, then filter + sort + materialise per interaction
+    store = InspectionStore()
+    store.append(base)
+    results["index_build"] = measure(lambda: InspectionIndex(store), repeat, min_seconds=min_time)
+    index = InspectionIndex(store)
+    results["filter_sort"] = measure(lambda: [index.query(**f) for f in FILTERS], repeat, min_seconds=min_time)
+    results["filter_sort"]["queries"] = len(FILTERS)
+
+    # --- dashboard: rollup build, then the page's aggregate queries after a save
+    results["rollup_build"] = measure(lambda: Rollups(store), repeat, min_seconds=min_time)
+    rollups = Rollups(store)
+    def dashboard():
+        rollups._frames.clear()  # as after an append
+        return ([rollups.status_counts(d) for d in ("item_group", "technician", "city", "variant_combo", "month")],
+                rollups.backlog(), rollups.value_sums())
+    results["dashboard"] = measure(dashboard, repeat, min_seconds=min_time)
+
+    # --- exports
+    view = index.query().head(xlsx_rows)
+    results["to_xlsx_bytes"] = measure(lambda: to_xlsx_bytes(view), max(1, repeat // 2))
+    results["to_xlsx_bytes"]["rows"] = len(view)
+    if DOCX_OK:
+        checklist = TemplateCatalog(DEFAULT_TEMPLATES).compile_all()
+        results["blank_form_docx"] = measure(lambda: build_blank_form_docx(checklist), repeat, min_seconds=min_time)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "inspections": n_inspections,
+            "rows": len(base),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _slower(cur: dict, old: dict, threshold: float) -> bool:
+    # Noise-aware: best *and* typical run must both exceed the threshold (one outlier run
+    # moves only one of them), by more than MIN_DELTA_SECONDS of timer/scheduler jitter.
+    median = "seconds_median" if "seconds_median" in old else "seconds_mean"  # older baselines
+    return (cur["seconds_min"] > threshold * old["seconds_min"]
+            and cur[median] > threshold * old[median]
+            and cur["seconds_min"] - old["seconds_min"] > MIN_DELTA_SECONDS)
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    """Print time/memory ratios against `baseline`; returns the number of regressions.
+
+    A time ratio (of the fastest runs) above `threshold` only counts as a regression if
+    the median run is slower by the same factor; otherwise it is reported as noise.
+    """
+    old_results = baseline.get("results", {})
+    regressions = 0
+    print(f"{'benchmark':<18}{'time ratio':>12}{'memory ratio':>14}")
+    for name, cur in current["results"].items():
+        old = old_results.get(name)
+        if old is None:
+            print(f"{name:<18}{'neu':>12}{'':>14}")
+            continue
+        t = cur["seconds_min"] / old["seconds_min"] if old["seconds_min"] else float("inf")
+        m = cur["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("inf")
+        if _slower(cur, old, threshold) or m > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        else:
+            flag = "  (Rauschen)" if t > threshold else ""
+        print(f"{name:<18}{t:>12.2f}{m:>14.2f}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inspections", type=int, default=2000, help="Begehungen im vorbefüllten Bestand")
+    parser.add_argument("--repeat", type=int, default=5, help="Mindestzahl Wiederholungen je Benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="Sekunden, die kurze Benchmarks mindestens wiederholt werden (weniger Rauschen)")
+    parser.add_argument("--rounds", type=int, default=3, help="Durchläufe der ganzen Suite, bester zählt")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--xlsx-rows", type=int, default=20_000, help="Zeilen für den XLSX-Export")
+    parser.add_argument("--out", help="Ergebnis-JSON (Default: stdout)")
+    parser.add_argument("--baseline", help="früheres Ergebnis-JSON zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Faktor, ab dem eine Regression gemeldet wird")
+    args = parser.parse_args(argv)
+
+    report = run(args.inspections, args.repeat, args.seed, args.xlsx_rows, args.min_time, args.rounds)
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        return 1 if compare(report, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Synthetic Begehungen built from the real checklist templates and the Musterkunde."""
+import random
+from datetime import date, timedelta
+from itertools import combinations
+from typing import List, Tuple
+
+import pandas as pd
+
+from begehung.defaults import DEFAULT_TEMPLATES, MUSTERKUNDE
+from begehung.records import build_batches, variant_combo
+from begehung.templates import VARIANTS, TemplateCatalog
+
+TECHNICIANS = ["Team Süd – Max & Lea", "Team Nord – Jan", "Team West – Aylin & Tom", "Team Ost – Petra", "Extern – Solarbau GmbH"]
+CITIES = [("Freiburg", "79100", "BW"), ("Karlsruhe", "76131", "BW"), ("München", "80331", "BY"),
+          ("Köln", "50667", "NW"), ("Leipzig", "04109", "SN"), ("Hamburg", "20095", "HH")]
+STATUS_WEIGHTS = [("ok", 0.5), ("offen", 0.3), ("kritisch", 0.1), ("n/a", 0.1)]
+# every non-empty variant combination: 13 (Bronze) … 60 (all three) checklist rows
+COMBOS = [list(c) for n in (1, 2, 3) for c in combinations(VARIANTS, n)]
+
+
+def generate(n_inspections: int, seed: int = 0, start: date = date(2025, 1, 1)) -> List[Tuple[dict, pd.DataFrame]]:
+    """(header, items) pairs as produced by the "Neue Begehung" form."""
+    rng = random.Random(seed)
+    catalog = TemplateCatalog(DEFAULT_TEMPLATES)
+    frames = {tuple(c): catalog.compile(c).frame(MUSTERKUNDE["prefill_values"]) for c in COMBOS}
+    statuses, weights = zip(*STATUS_WEIGHTS)
+    out = []
+    for i in range(n_inspections):
+        combo = rng.choice(COMBOS)
+        city, plz, land = rng.choice(CITIES)
+        header = {
+            "date": start + timedelta(days=rng.randrange(365)),
+            "technician": rng.choice(TECHNICIANS),
+            "customer_name": f"WEG Beispielstraße {i}",
+            "customer_email": f"verwaltung{i % 97}@example.com",
+            "customer_phone": MUSTERKUNDE["customer_phone"],
+            "address": f"Beispielstraße {i}",
+            "city": city, "plz": plz, "bundesland": land,
+            "liegenschaftsnummer": f"LG-2025-{i % 5000:04d}",
+            "variant_combo": variant_combo(combo),
+        }
+        items = frames[tuple(combo)].copy()
+        items["status"] = rng.choices(statuses, weights, k=len(items))
+        out.append((header, items))
+    return out
+
+
+def generate_frame(n_inspections: int, seed: int = 0) -> pd.DataFrame:
+    """Flat rows (CSV layout) for `n_inspections` synthetic Begehungen."""
+    return build_batches(generate(n_inspections, seed=seed))
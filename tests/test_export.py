@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from begehung.export import iter_chunks, write_xlsx
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _frame(ids, rows_per_id=2):
+    return pd.DataFrame({
+        "inspection_id": [i for i in ids for _ in range(rows_per_id)],
+        "item_text": [f"Punkt {n}" for _ in ids for n in range(rows_per_id)],
+    })
+
+
+def test_write_xlsx_more_sheets_than_open_files(tmp_path):
+    resource = pytest.importorskip("resource")
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    limit = 128
+    frame = _frame([f"INS-{i:04d}" for i in range(limit + 40)])
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(limit, hard), hard))
+    try:
+        written = write_xlsx(iter_chunks(frame, chunk_rows=50), tmp_path / "x.xlsx", split="inspection")
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert len(written) == limit + 40 and set(written.values()) == {2}
+    wb = openpyxl.load_workbook(tmp_path / "x.xlsx", read_only=True)
+    assert wb.sheetnames[0] == "INS-0000" and len(wb.sheetnames) == limit + 40
+    assert [r for r in wb["INS-0001"].values] == [("inspection_id", "item_text"),
+                                                  ("INS-0001", "Punkt 0"), ("INS-0001", "Punkt 1")]
+
+
+def test_write_xlsx_reopened_key_continues_on_next_sheet(tmp_path):
+    frame = _frame(["A", "B", "A"], rows_per_id=1)
+    written = write_xlsx(iter_chunks(frame), tmp_path / "x.xlsx", split="inspection", max_open=1)
+    assert written == {"A": 1, "B": 1, "A (2)": 1}
+
+
+def test_write_xlsx_max_rows_overflow(tmp_path):
+    written = write_xlsx(iter_chunks(_frame(["A"], rows_per_id=5)), tmp_path / "x.xlsx", max_rows=3)
+    assert written == {"Begehungen": 2, "Begehungen (2)": 2, "Begehungen (3)": 1}
+
+
+def test_write_xlsx_empty_export_has_header(tmp_path):
+    written = write_xlsx(iter([]), tmp_path / "x.xlsx", columns=["inspection_id", "item_text"])
+    assert written == {"Begehungen": 0}
+    ws = openpyxl.load_workbook(tmp_path / "x.xlsx").active
+    assert [c.value for c in next(ws.iter_rows())] == ["inspection_id", "item_text"]
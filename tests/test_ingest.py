@@ -0,0 +1,54 @@
+import io
+
+import pandas as pd
+import pytest
+
+from begehung.ingest import REQUIRED_COLUMNS, import_csv
+from begehung.store import InspectionStore
+
+
+def _line(inspection_id="INS-1", item_id="1", date="2024-05-01", status="ok", value="30"):
+    row = dict.fromkeys(REQUIRED_COLUMNS, "x")
+    row.update(inspection_id=inspection_id, item_id=item_id, date=date, status=status, value=value, unit="kWp")
+    return row
+
+
+ROWS = [
+    _line(item_id="1"),                       # line 2
+    _line(item_id="2", status="n/a"),         # line 3: "n/a" is a status, not a missing value
+    _line(item_id="3", date="31.02.2024"),    # line 4: bad date
+    _line(item_id="4", status="erledigt"),    # line 5: bad status
+    _line(item_id=""),                        # line 6: missing key
+    _line(inspection_id="INS-2", item_id="1", date="2024-06-03"),  # line 7
+    _line(item_id="1"),                       # line 8: repeated within the upload
+]
+
+
+def _csv(rows) -> io.BytesIO:
+    return io.BytesIO(pd.DataFrame(rows).to_csv(index=False).encode("utf-8"))
+
+
+def test_import_csv_rejects_and_counts_across_chunks():
+    store = InspectionStore()
+    result = import_csv(_csv(ROWS), store, chunksize=2)
+    assert (result.rows_read, result.rows_added, result.rows_duplicate, result.rows_rejected) == (7, 3, 1, 3)
+    rejected = result.rejected_frame()
+    assert rejected[["line", "reason"]].values.tolist() == [
+        [4, "Datum ungültig"], [5, "Status ungültig"], [6, "inspection_id/item_id fehlt"]]
+    frame = store.frame()
+    assert frame["item_id"].tolist() == ["1", "2", "1"]
+    assert frame["status"].tolist() == ["ok", "n/a", "ok"]
+    assert frame["value"].tolist() == ["30", "30", "30"]
+
+
+def test_import_csv_repeated_upload_adds_nothing():
+    store = InspectionStore()
+    import_csv(_csv(ROWS), store, chunksize=2)
+    again = import_csv(_csv(ROWS), store, chunksize=3)
+    assert (again.rows_added, again.rows_duplicate, again.rows_rejected) == (0, 4, 3)
+    assert len(store) == 3
+
+
+def test_import_csv_missing_columns():
+    with pytest.raises(ValueError, match="Fehlende Spalten: status"):
+        import_csv(_csv([{k: v for k, v in _line().items() if k != "status"}]), InspectionStore())
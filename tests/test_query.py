@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from begehung.query import InspectionIndex
+from begehung.schema import COLUMNS
+from begehung.store import InspectionStore
+from begehung.values import PARSED_COLUMNS
+
+TECHNICIANS = ["Team Süd", "team nord", "Müller", "AB", None]
+CITIES = ["Köln", "Freiburg", "KÖLN-Porz", "Bad Kö", None]
+VARIANTS = ["Bronze", "Bronze+Silber", "Gold", "Silber+Gold", None]
+DATES = ["2024-05-01", "2024-01-15", "2023-12-31", "2024-05-01", None]
+VALUES = [("30", "kWp"), ("0,75 MWp", "kWp"), ("1.234,5", "€"), ("ja", ""), ("", "kWh/a"), (None, None)]
+
+
+def _batch(rng, n_inspections: int, start: int) -> pd.DataFrame:
+    rows = []
+    for i in range(start, start + n_inspections):
+        header = {"inspection_id": f"INS-{rng.integers(1000):04d}-{i}", "date": DATES[rng.integers(len(DATES))],
+                  "technician": TECHNICIANS[rng.integers(len(TECHNICIANS))],
+                  "city": CITIES[rng.integers(len(CITIES))], "variant_combo": VARIANTS[rng.integers(len(VARIANTS))]}
+        for j in rng.permutation(4):
+            value, unit = VALUES[rng.integers(len(VALUES))]
+            rows.append({**header, "item_id": f"{i}-{j}", "item_group": "Dach", "item_text": f"Punkt {j}",
+                         "status": ["ok", "offen", "kritisch", "n/a"][rng.integers(4)], "value": value, "unit": unit})
+    return pd.DataFrame(rows)
+
+
+def _expected(frame: pd.DataFrame, technician="", city="", status=None, variant="", unit="",
+              value_min=None, value_max=None) -> np.ndarray:
+    # the pandas expression the index replaces
+    mask = pd.Series(True, index=frame.index)
+    for col, needle in (("technician", technician), ("city", city), ("variant_combo", variant)):
+        if needle:
+            mask &= frame[col].str.contains(needle, case=False, regex=False).fillna(False).astype(bool)
+    if status is not None:
+        mask &= frame["status"].eq(status).fillna(False).astype(bool)
+    if unit:
+        mask &= frame["value_unit"].eq(unit).fillna(False).astype(bool)
+    if value_min is not None:
+        mask &= frame["value_num"].ge(value_min)
+    if value_max is not None:
+        mask &= frame["value_num"].le(value_max)
+    return frame[mask].sort_values(["date", "inspection_id", "item_id"]).index.to_numpy()
+
+
+FILTERS = [
+    {},
+    {"technician": "team"}, {"technician": "s"}, {"technician": "AB"}, {"technician": "ü"},
+    {"city": "köln"}, {"city": "KÖ"}, {"city": "xyz"},
+    {"variant": "bronze+silber"}, {"variant": "d"},
+    {"status": "n/a"}, {"status": "kritisch", "city": "frei"},
+    {"unit": "kWp"}, {"unit": "kWp", "value_min": 20, "value_max": 40}, {"unit": "€", "value_min": 1000},
+    {"technician": "team", "city": "köln", "status": "offen", "variant": "bronze"},
+]
+
+
+@pytest.fixture
+def store():
+    rng = np.random.default_rng(7)
+    store = InspectionStore()
+    store.append(_batch(rng, 30, 0))
+    return store, rng
+
+
+def _check(index: InspectionIndex, store: InspectionStore):
+    frame = store.flat(columns=COLUMNS + PARSED_COLUMNS).reset_index(drop=True)
+    for filters in FILTERS:
+        np.testing.assert_array_equal(index.select(**filters), _expected(frame, **filters), err_msg=str(filters))
+
+
+def test_select_matches_pandas_filter_and_sort(store):
+    store, rng = store
+    index = InspectionIndex(store)
+    _check(index, store)
+    # later appends: some sort after everything (extend), others earlier or NaT (lazy resort)
+    for start in range(30, 70, 10):
+        store.append(_batch(rng, 10, start))
+        _check(index, store)
+    _check(InspectionIndex(store), store)
+
+
+def test_out_of_order_append_forces_resort(store):
+    store, _ = store
+    index = InspectionIndex(store)
+    index.order()
+    early = pd.DataFrame({"inspection_id": ["INS-0000-early"], "date": ["2000-01-01"], "item_id": ["x"],
+                          "status": ["ok"], "value": ["1"], "unit": ["kWp"]})
+    store.append(early)
+    assert index.select()[0] == len(store) - 1
+    _check(index, store)
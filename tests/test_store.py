@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from begehung.backend import Backend
+from begehung.store import SEGMENT_RE, InspectionStore
+
+pytest.importorskip("pyarrow")
+
+
+def _rows(inspection_id: str, n: int = 3, date: str = "2024-05-01") -> pd.DataFrame:
+    return pd.DataFrame({
+        "inspection_id": inspection_id, "date": date, "technician": "Team Süd", "city": "Köln",
+        "variant_combo": "Bronze", "item_id": [f"{inspection_id}-{i}" for i in range(n)],
+        "item_group": "Dach", "item_text": [f"Punkt {i}" for i in range(n)],
+        "status": "n/a", "value": "30", "unit": "kWp",
+    })
+
+
+def _segments(root):
+    return sorted(p.name for p in root.iterdir() if SEGMENT_RE.match(p.name))
+
+
+def test_round_trip_after_reopen(tmp_path):
+    store = InspectionStore(tmp_path)
+    for i in range(10):
+        store.append(_rows(f"INS-{i:02d}"))
+    reopened = InspectionStore(tmp_path)
+    assert len(reopened) == 30
+    pd.testing.assert_frame_equal(reopened.frame(), store.frame())
+    assert reopened.frame()["status"].eq("n/a").all()
+    # the next append continues after the last sequence on disk
+    reopened.append(_rows("INS-10"))
+    assert len(InspectionStore(tmp_path)) == 33
+
+
+def test_size_tiered_merge_keeps_few_segments(tmp_path):
+    store = InspectionStore(tmp_path)
+    for i in range(64):
+        store.append(_rows(f"INS-{i:02d}"))
+    assert len(_segments(tmp_path)) <= 7  # O(log n) files for 64 equal appends
+    store.compact()
+    assert _segments(tmp_path) == ["seg-000001-000064.parquet"]
+    pd.testing.assert_frame_equal(InspectionStore(tmp_path).frame(), store.frame())
+
+
+def test_stale_segments_are_removed_on_load(tmp_path):
+    store = InspectionStore(tmp_path)
+    store.append(_rows("INS-01"))
+    stale = tmp_path / "seg-000001-000001.parquet"
+    stale_copy = stale.read_bytes()
+    store.append(_rows("INS-02"))  # merges 1 and 2
+    assert _segments(tmp_path) == ["seg-000001-000002.parquet"]
+    stale.write_bytes(stale_copy)  # e.g. left behind by a crash before the unlink
+    reopened = InspectionStore(tmp_path)
+    assert len(reopened) == 6
+    assert _segments(tmp_path) == ["seg-000001-000002.parquet"]
+
+
+def test_refresh_picks_up_segments_merged_by_another_instance(tmp_path):
+    backend = Backend(tmp_path / "begehung.db")
+    a = InspectionStore(tmp_path / "inspections", backend=backend)
+    b = InspectionStore(tmp_path / "inspections", backend=backend)
+    a.append(_rows("INS-01"))
+    assert b.refresh() == 3
+    a.append(_rows("INS-02"))
+    a.append(_rows("INS-03", date="2024-04-01"))
+    # b never saw segments 2 and 3 as single files – only inside a merged one
+    assert not (tmp_path / "inspections" / "seg-000002-000002.parquet").exists()
+    assert b.refresh() == 6
+    pd.testing.assert_frame_equal(b.frame(), a.frame())
+    assert b.refresh() == 0
+
+
+def test_merge_skips_known_and_repeated_keys(tmp_path):
+    backend = Backend(tmp_path / "begehung.db")
+    a = InspectionStore(tmp_path / "inspections", backend=backend)
+    b = InspectionStore(tmp_path / "inspections", backend=backend)
+    a.append(_rows("INS-01"))
+    upload = pd.concat([_rows("INS-01"), _rows("INS-02"), _rows("INS-02")])
+    added = b.merge(upload)  # b has not refreshed yet – merge catches up first
+    assert added["item_id"].tolist() == ["INS-02-0", "INS-02-1", "INS-02-2"]
+    assert b.merge(upload).empty
+    assert len(b) == 6 and a.refresh() == 3 and len(a) == 6
@@ -0,0 +1,56 @@
+import math
+
+import pandas as pd
+import pytest
+
+from begehung.values import parse_values
+
+CASES = [
+    # value, unit, value_num, value_unit, value_error
+    ("30", "kWp", 30.0, "kWp", False),
+    ("28.500", "kWh/a", 28500.0, "kWh/a", False),
+    ("1.234,5", "€", 1234.5, "€", False),
+    ("1,234.5", "€", 1234.5, "€", False),
+    ("2,5", "kWp", 2.5, "kWp", False),
+    ("12.5", "kW", 12.5, "kW", False),
+    ("0.500", "kWp", 0.5, "kWp", False),
+    ("0.750 MWp", "", 750.0, "kWp", False),
+    ("0,5 MWh/a", "", 500.0, "kWh/a", False),
+    ("12,5 kWp", "", 12.5, "kWp", False),
+    ("ca. 2500", "€", 2500.0, "€", False),
+    ("3 T€", "", 3000.0, "€", False),
+    ("30%", "", 30.0, "%", False),
+    ("1 234", "kWh", 1234.0, "kWh", False),
+    ("0,75 MWp", "kWp", 750.0, "kWp", False),
+    ("500 W", "kWp", 0.5, "kW", True),
+    ("2024-05-01", "", math.nan, "", True),
+    ("abc", "kWp", math.nan, "kWp", True),
+    ("ja", "", math.nan, "", False),
+    ("", "kWp", math.nan, "kWp", False),
+    (None, "", math.nan, "", False),
+]
+
+
+@pytest.mark.parametrize("value,unit,num,canonical,error", CASES)
+def test_parse_values(value, unit, num, canonical, error):
+    parsed = parse_values(pd.Series([value], dtype="string"), pd.Series([unit], dtype="string")).iloc[0]
+    if math.isnan(num):
+        assert math.isnan(parsed["value_num"])
+    else:
+        assert parsed["value_num"] == pytest.approx(num)
+    assert parsed["value_unit"] == canonical
+    assert bool(parsed["value_error"]) is error
+
+
+def test_parse_values_column_wise():
+    values = pd.Series([v for v, *_ in CASES], dtype="string")
+    units = pd.Series([u for _, u, *_ in CASES], dtype="string")
+    parsed = parse_values(values, units)
+    assert list(parsed.columns) == ["value_num", "value_unit", "value_error"]
+    assert parsed["value_num"].dtype == "float64"
+    assert parsed["value_error"].tolist() == [e for *_, e in CASES]
+
+
+def test_parse_values_empty():
+    parsed = parse_values(pd.Series([], dtype="string"), pd.Series([], dtype="string"))
+    assert parsed.empty and parsed["value_num"].dtype == "float64"